@@ -3,6 +3,7 @@ League Site - Production Flask Application Factory
 Football league management system similar to English Premier League.
 """
 
+import click
 from flask import Flask
 from flask_migrate import Migrate
 
@@ -29,6 +30,10 @@ def create_app(config_name: str = "development") -> Flask:
     
     # Load configuration
     app.config.from_object(config[config_name])
+
+    # JSON responses: orjson when installed, stdlib otherwise
+    from app.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
     
     # Initialize extensions
     db.init_app(app)
@@ -162,7 +167,90 @@ def register_commands(app: Flask) -> None:
         """Initialize the database."""
         db.create_all()
         print("Database initialized.")
-    
+
+    @app.cli.command("check-standings")
+    @click.option("--season-id", type=int, default=None, help="Season to check (default: all).")
+    @click.option("--repair", is_flag=True, help="Run a full recompute for inconsistent seasons.")
+    def check_standings(season_id, repair):
+        """Compare stored standings with a full recompute."""
+        from app.models import Season
+        from app.services.standings_service import StandingsService
+
+        seasons = [Season.query.get_or_404(season_id)] if season_id else Season.query.all()
+        for season in seasons:
+            mismatched = StandingsService.check_standings(season.id)
+            if not mismatched:
+                print(f"{season.name}: standings consistent.")
+                continue
+            print(f"{season.name}: {len(mismatched)} team(s) out of date: {mismatched}")
+            if repair:
+                written = StandingsService.update_standings(season.id)
+                print(f"{season.name}: standings recomputed ({written} row(s) written).")
+
+    @app.cli.command("backfill-snapshots")
+    @click.option("--season-id", type=int, default=None, help="Season to backfill (default: all).")
+    def backfill_snapshots(season_id):
+        """Build per-matchday standings snapshots for past seasons."""
+        from app.models import Season
+        from app.services.snapshot_service import SnapshotService
+
+        seasons = [Season.query.get_or_404(season_id)] if season_id else Season.query.all()
+        for season in seasons:
+            written = SnapshotService.backfill(season.id)
+            print(f"{season.name}: {written} snapshot row(s) written.")
+
+    @app.cli.command("backfill-player-stats")
+    @click.option("--season-id", type=int, default=None, help="Season to rebuild (default: all).")
+    def backfill_player_stats(season_id):
+        """Rebuild per-season player statistics from match events."""
+        from app.models import Season
+        from app.services.match_service import MatchService
+
+        seasons = [Season.query.get_or_404(season_id)] if season_id else Season.query.all()
+        for season in seasons:
+            written = MatchService.rebuild_player_season_stats(season.id)
+            print(f"{season.name}: {written} player stat row(s) written.")
+
+    @app.cli.command("backfill-visit-rollups")
+    def backfill_visit_rollups():
+        """Rebuild visit rollups and unique-visitor sketches from the visitors table."""
+        from app.services.visitor_service import rebuild_visit_rollups
+
+        hourly, daily, sketches = rebuild_visit_rollups()
+        print(f"Visit rollups rebuilt: {hourly} hourly, {daily} daily row(s), {sketches} sketch(es).")
+
+    @app.cli.command("compact-visit-log")
+    @click.option("--retention-days", type=int, default=None, help="Raw hits to keep (default: VISITOR_LOG_RETENTION_DAYS).")
+    @click.option("--batch-size", type=int, default=5000, help="Rows deleted per transaction.")
+    @click.option("--prune-visitors", is_flag=True, help="Also delete visitor rows not seen within the retention window.")
+    def compact_visit_log(retention_days, batch_size, prune_visitors):
+        """Compact expired visit log tables into the daily rollups and drop them."""
+        from app.services.visit_log_service import VisitLogService
+
+        if retention_days is None:
+            retention_days = app.config["VISITOR_LOG_RETENTION_DAYS"]
+        compacted = VisitLogService.compact(retention_days, batch_size)
+        for name, hits in compacted:
+            print(f"{name}: {hits} hit(s) compacted, table dropped.")
+        if not compacted:
+            print("No visit log tables past retention.")
+        if prune_visitors:
+            pruned = VisitLogService.prune_visitors(retention_days, batch_size)
+            print(f"{pruned} stale visitor row(s) deleted.")
+
+    @app.cli.command("recompute-worker")
+    @click.option("--interval", type=float, default=2.0, help="Seconds between polls.")
+    @click.option("--once", is_flag=True, help="Process pending seasons once and exit.")
+    @click.option("--reset-failed", is_flag=True, help="Retry seasons whose recompute gave up.")
+    def recompute_worker(interval, once, reset_failed):
+        """Run queued standings/snapshot recomputes (STANDINGS_RECOMPUTE=worker)."""
+        from app.services.recompute_service import RecomputeService
+
+        if reset_failed:
+            print(f"{RecomputeService.reset_failures()} season(s) reset for retry.")
+        print("Recompute worker started.")
+        RecomputeService.run_worker(poll_interval=interval, once=once)
+
     @app.cli.command("create-admin")
     def create_admin():
         """Create an admin user (run in Flask shell or add proper implementation)."""
@@ -0,0 +1,228 @@
+"""
+Sparse fieldsets for API lists (?fields=id,name).
+Each resource maps its output fields to columns; a request selects only the
+columns and joins its fields need and serializes straight from row tuples.
+"""
+
+from operator import itemgetter
+
+from sqlalchemy.orm import aliased
+
+from app.extensions import db
+from app.models import Standing, Team, Player, Match
+
+
+class Field:
+    """
+    One output field: a column (optionally passed through compute), or a
+    value computed from other fields of the same resource (sources).
+    """
+
+    __slots__ = ("column", "compute", "sources", "join")
+
+    def __init__(self, column=None, compute=None, sources=(), join=None):
+        self.column = column
+        self.compute = compute
+        self.sources = sources
+        self.join = join  # Key into Resource.joins needed for the column
+
+
+class Resource:
+    """Field map for one API list, with cached per-fieldset query plans."""
+
+    def __init__(self, model, fields: dict, joins: dict | None = None):
+        self.model = model
+        self.fields = fields
+        self.joins = joins or {}  # name -> (target, onclause)
+        self._plans = {}
+
+    def parse(self, raw: str | None) -> tuple:
+        """
+        Field names from a ?fields= value (all fields when empty).
+
+        Raises:
+            ValueError: unknown field names
+        """
+        if not raw:
+            return tuple(self.fields)
+        names = tuple(dict.fromkeys(n.strip() for n in raw.split(",") if n.strip()))
+        unknown = [n for n in names if n not in self.fields]
+        if unknown or not names:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}."
+            )
+        return names
+
+    def query(self, names: tuple, keys: tuple = ()):
+        """
+        Column-only query for the fields; sort keys are selected too, labelled
+        with their attribute name, so cursor pagination can read them off rows.
+        """
+        columns, joins, _ = self._plan(names, keys)
+        q = db.session.query(*columns).select_from(self.model)
+        for join in joins:
+            target, onclause = self.joins[join]
+            q = q.join(target, onclause)
+        return q
+
+    def serialize(self, names: tuple, rows, keys: tuple = ()) -> list:
+        """Rows from query(names, keys) as a list of dicts in field order."""
+        return list(map(self._plan(names, keys)[2], rows))
+
+    def _plan(self, names: tuple, keys: tuple) -> tuple:
+        """(labelled columns, joins, row -> dict serializer), built once per fieldset."""
+        plan_key = (names, tuple(k.key for k in keys))
+        plan = self._plans.get(plan_key)
+        if plan is not None:
+            return plan
+
+        labels = {}  # label -> column, in select order
+        joins = []
+
+        def require(name):
+            field = self.fields[name]
+            if field.column is not None and name not in labels:
+                labels[name] = field.column.label(name)
+                if field.join and field.join not in joins:
+                    joins.append(field.join)
+            for source in field.sources:
+                require(source)
+
+        for name in names:
+            require(name)
+        for key in keys:
+            labels.setdefault(key.key, key.label(key.key))
+
+        # Computed values are appended to the row tuple, so every field has a
+        # fixed position and one itemgetter picks them all in field order
+        index = {label: i for i, label in enumerate(labels)}
+        computed = []  # (compute, source positions)
+        positions = []
+        for name in names:
+            field = self.fields[name]
+            if field.compute is None:
+                positions.append(index[name])
+                continue
+            sources = field.sources or (name,)
+            computed.append((field.compute, tuple(index[s] for s in sources)))
+            positions.append(len(labels) + len(computed) - 1)
+
+        plan = (list(labels.values()), joins, _row_serializer(names, positions, computed))
+        self._plans[plan_key] = plan
+        return plan
+
+
+def _row_serializer(names: tuple, positions: list, computed: list):
+    """Compile a row -> dict function for one fieldset (no per-row lookups by name)."""
+    if len(positions) == 1:
+        def pick(values, position=positions[0]):
+            return (values[position],)
+    else:
+        pick = itemgetter(*positions)
+
+    if not computed:
+        return lambda row: dict(zip(names, pick(row)))
+
+    def serialize(row):
+        extended = (*row, *[compute(*[row[i] for i in sources]) for compute, sources in computed])
+        return dict(zip(names, pick(extended)))
+
+    return serialize
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _score_display(is_played, home_goals, away_goals):
+    if is_played and home_goals is not None and away_goals is not None:
+        return f"{home_goals} - {away_goals}"
+    return "vs"
+
+
+_home_team = aliased(Team, name="home_team")
+_away_team = aliased(Team, name="away_team")
+
+
+STANDINGS = Resource(
+    Standing,
+    {
+        "position": Field(Standing.position),
+        "previous_position": Field(Standing.previous_position),
+        "position_change": Field(
+            compute=lambda previous, position: None if previous is None else previous - position,
+            sources=("previous_position", "position"),
+        ),
+        "team_id": Field(Standing.team_id),
+        "team_name": Field(Team.name, join="team"),
+        "team_short_name": Field(Team.short_name, join="team"),
+        "played": Field(Standing.played),
+        "won": Field(Standing.won),
+        "drawn": Field(Standing.drawn),
+        "lost": Field(Standing.lost),
+        "goals_for": Field(Standing.goals_for),
+        "goals_against": Field(Standing.goals_against),
+        "goal_difference": Field(Standing.goal_difference),
+        "points": Field(Standing.points),
+        "form": Field(Standing.form, compute=lambda form: form or ""),
+    },
+    joins={"team": (Team, Team.id == Standing.team_id)},
+)
+
+TEAMS = Resource(
+    Team,
+    {
+        "id": Field(Team.id),
+        "name": Field(Team.name),
+        "short_name": Field(Team.short_name),
+        "logo": Field(Team.logo_filename),
+        "founded_year": Field(Team.founded_year),
+        "stadium": Field(Team.stadium),
+    },
+)
+
+PLAYERS = Resource(
+    Player,
+    {
+        "id": Field(Player.id),
+        "first_name": Field(Player.first_name),
+        "last_name": Field(Player.last_name),
+        "full_name": Field(
+            compute=lambda first, last: f"{first} {last}",
+            sources=("first_name", "last_name"),
+        ),
+        "team_id": Field(Player.team_id),
+        "team_name": Field(Team.name, join="team"),
+        "position": Field(Player.position),
+        "jersey_number": Field(Player.jersey_number),
+        "age": Field(Player.age),
+        "goals": Field(Player.goals),
+        "assists": Field(Player.assists),
+        "appearances": Field(Player.appearances),
+    },
+    joins={"team": (Team, Team.id == Player.team_id)},
+)
+
+MATCHES = Resource(
+    Match,
+    {
+        "id": Field(Match.id),
+        "matchday": Field(Match.matchday),
+        "kickoff": Field(Match.kickoff, compute=_isoformat),
+        "home_team_id": Field(Match.home_team_id),
+        "home_team_name": Field(_home_team.name, join="home_team"),
+        "away_team_id": Field(Match.away_team_id),
+        "away_team_name": Field(_away_team.name, join="away_team"),
+        "home_goals": Field(Match.home_goals),
+        "away_goals": Field(Match.away_goals),
+        "is_played": Field(Match.is_played),
+        "score_display": Field(
+            compute=_score_display,
+            sources=("is_played", "home_goals", "away_goals"),
+        ),
+    },
+    joins={
+        "home_team": (_home_team, _home_team.id == Match.home_team_id),
+        "away_team": (_away_team, _away_team.id == Match.away_team_id),
+    },
+)
@@ -2,36 +2,141 @@
 REST API routes - JSON responses for /api/table, /api/teams, etc.
 """
 
-from flask import jsonify, request
+import queue
+from urllib.parse import parse_qsl, urlsplit
+
+from flask import Response, current_app, g, jsonify, request, stream_with_context
+from werkzeug.datastructures import ImmutableMultiDict
+from werkzeug.exceptions import HTTPException
 
 from app.api import api_bp
+from app.api.fields import STANDINGS, TEAMS, PLAYERS, MATCHES
+from app.decorators import cached_response
+from app.extensions import csrf, db
 from app.models import Season, Standing, Team, Player, Match
+from app.services.snapshot_service import SnapshotService
+from app.services.leaderboard_service import LeaderboardService
+from app.services.pagination_service import PaginationService
+from app.services.export_service import ExportService
+from app.services.cache_service import CacheService
 
 
 def _get_current_season():
-    """Get active or latest season."""
-    s = Season.query.filter_by(is_active=True).first()
-    if not s:
-        s = Season.query.order_by(Season.start_date.desc()).first()
-    return s
+    """Get active or latest season (looked up once per app context, shared by /api/batch)."""
+    if "current_season" not in g:
+        s = Season.query.filter_by(is_active=True).first()
+        if not s:
+            s = Season.query.order_by(Season.start_date.desc()).first()
+        g.current_season = s
+    return g.current_season
 
 
-@api_bp.route("/table")
-def table():
-    """GET /api/table - League standings as JSON."""
+def _team_names() -> dict:
+    """{team id: name}, loaded once per app context."""
+    if "team_names" not in g:
+        g.team_names = dict(db.session.query(Team.id, Team.name).all())
+    return g.team_names
+
+
+class ApiError(Exception):
+    """Client error raised by the view helpers; rendered as {"error": message}."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+@api_bp.errorhandler(ApiError)
+def api_error(e):
+    return jsonify({"error": e.message}), e.status
+
+
+def _fields(resource, args) -> tuple:
+    """Field names from ?fields= (all by default); ApiError on unknown names."""
+    try:
+        return resource.parse(args.get("fields"))
+    except ValueError as e:
+        raise ApiError(str(e)) from None
+
+
+def _paginate(q, keys: tuple, args) -> tuple:
+    """
+    Page a list query from ?cursor= (keyset) or ?page= (offset, the old
+    interface). Offset pages report total/pages as before; cursor pages
+    only with ?total=1.
+
+    Returns:
+        (items, pagination fields for the response)
+    """
+    per_page = max(1, min(args.get("per_page", 20, type=int), 100))
+    cursor = args.get("cursor") or None
+    with_total = cursor is None or args.get("total") == "1"
+    try:
+        result = PaginationService.paginate(
+            q,
+            keys,
+            per_page,
+            cursor=cursor,
+            page=args.get("page", 1, type=int),
+            with_total=with_total,
+        )
+    except ValueError:
+        raise ApiError("Invalid cursor.") from None
+
+    fields = {"per_page": per_page, "next_cursor": result.next_cursor, "prev_cursor": result.prev_cursor}
+    if result.page is not None:
+        fields["page"] = result.page
+    if result.total is not None:
+        fields["total"] = result.total
+        fields["pages"] = result.pages
+    return result.items, fields
+
+
+# View helpers: build a response dict from query args (shared by the
+# routes below and /api/batch)
+
+
+def _table_data(args) -> dict:
     season = _get_current_season()
     if not season:
-        return jsonify({"season": None, "standings": []})
+        return {"season": None, "standings": []}
+
+    names = _fields(STANDINGS, args)
+    matchday = args.get("matchday", type=int)
+    if matchday is not None:
+        return _table_as_of(season, matchday, names, trim=bool(args.get("fields")))
 
-    standings = Standing.query.filter_by(season_id=season.id).order_by(Standing.position).all()
+    rows = (
+        STANDINGS.query(names)
+        .filter(Standing.season_id == season.id)
+        .order_by(Standing.position)
+        .all()
+    )
+    return {
+        "season": season.name,
+        "season_id": season.id,
+        "standings_version": season.standings_version,
+        "standings_updating": season.standings_dirty,
+        "standings_recompute_failed": season.recompute_failures > 0,
+        "standings": STANDINGS.serialize(names, rows),
+    }
+
+
+def _table_as_of(season, matchday: int, names: tuple, trim: bool) -> dict:
+    """League table after a matchday, served from standing snapshots (no form column)."""
+    snapshot_md, rows, previous = SnapshotService.table_as_of(season.id, matchday)
     data = {
         "season": season.name,
         "season_id": season.id,
+        "matchday": snapshot_md,
         "standings": [
             {
                 "position": s.position,
-                "previous_position": s.previous_position,
-                "position_change": s.position_change,
+                "previous_position": previous.get(s.team_id),
+                "position_change": (
+                    previous[s.team_id] - s.position if s.team_id in previous else None
+                ),
                 "team_id": s.team_id,
                 "team_name": s.team.name,
                 "team_short_name": s.team.short_name,
@@ -43,53 +148,58 @@ def table():
                 "goals_against": s.goals_against,
                 "goal_difference": s.goal_difference,
                 "points": s.points,
-                "form": s.form or "",
             }
-            for s in standings
+            for s in rows
         ],
     }
-    return jsonify(data)
+    if trim:
+        data["standings"] = [
+            {name: row[name] for name in names if name in row} for row in data["standings"]
+        ]
+    return data
 
 
-@api_bp.route("/teams")
-def teams():
-    """GET /api/teams - Teams list with optional search and pagination."""
-    q = Team.query
-    search = request.args.get("q", "").strip()
+def _team_history_data(args, team_id: int) -> dict:
+    team = Team.query.get_or_404(team_id)
+    season_id = args.get("season_id", type=int)
+    season = Season.query.get_or_404(season_id) if season_id else _get_current_season()
+    if not season:
+        return {"season": None, "team_id": team.id, "history": []}
+
+    return {
+        "season": season.name,
+        "season_id": season.id,
+        "team_id": team.id,
+        "team_name": team.name,
+        "history": [
+            {"matchday": matchday, "position": position, "points": points}
+            for matchday, position, points in SnapshotService.team_history(season.id, team.id)
+        ],
+    }
+
+
+def _teams_data(args) -> dict:
+    names = _fields(TEAMS, args)
+    keys = (Team.name, Team.id)
+    q = TEAMS.query(names, keys)
+    search = args.get("q", "").strip()
     if search:
         q = q.filter(
             Team.name.ilike(f"%{search}%") | Team.short_name.ilike(f"%{search}%")
         )
-    page = request.args.get("page", 1, type=int)
-    per_page = min(request.args.get("per_page", 20, type=int), 100)
-    pagination = q.order_by(Team.name).paginate(page=page, per_page=per_page, error_out=False)
-
-    data = {
-        "teams": [
-            {
-                "id": t.id,
-                "name": t.name,
-                "short_name": t.short_name,
-                "logo": t.logo_filename,
-                "founded_year": t.founded_year,
-                "stadium": t.stadium,
-            }
-            for t in pagination.items
-        ],
-        "total": pagination.total,
-        "page": page,
-        "per_page": per_page,
-        "pages": pagination.pages,
+    rows, pagination = _paginate(q, keys, args)
+    return {
+        "teams": TEAMS.serialize(names, rows, keys),
+        **pagination,
     }
-    return jsonify(data)
 
 
-@api_bp.route("/players")
-def players():
-    """GET /api/players - Players list with search and pagination."""
-    q = Player.query.join(Team)
-    search = request.args.get("q", "").strip()
-    team_id = request.args.get("team_id", type=int)
+def _players_data(args) -> dict:
+    names = _fields(PLAYERS, args)
+    keys = (Player.last_name, Player.id)
+    q = PLAYERS.query(names, keys)
+    search = args.get("q", "").strip()
+    team_id = args.get("team_id", type=int)
     if search:
         q = q.filter(
             Player.first_name.ilike(f"%{search}%")
@@ -97,74 +207,275 @@ def players():
         )
     if team_id:
         q = q.filter(Player.team_id == team_id)
+    rows, pagination = _paginate(q, keys, args)
+    return {
+        "players": PLAYERS.serialize(names, rows, keys),
+        **pagination,
+    }
 
-    page = request.args.get("page", 1, type=int)
-    per_page = min(request.args.get("per_page", 20, type=int), 100)
-    pagination = q.order_by(Player.last_name).paginate(page=page, per_page=per_page, error_out=False)
 
-    data = {
-        "players": [
-            {
-                "id": p.id,
-                "first_name": p.first_name,
-                "last_name": p.last_name,
-                "full_name": p.full_name,
-                "team_id": p.team_id,
-                "team_name": p.team.name,
-                "position": p.position,
-                "jersey_number": p.jersey_number,
-                "age": p.age,
-                "goals": p.goals,
-                "assists": p.assists,
-                "appearances": p.appearances,
-            }
-            for p in pagination.items
-        ],
-        "total": pagination.total,
-        "page": page,
-        "per_page": per_page,
-        "pages": pagination.pages,
+def _matches_data(args) -> dict:
+    season = _get_current_season()
+    if not season:
+        return {"season": None, "matches": []}
+
+    names = _fields(MATCHES, args)
+    keys = (Match.matchday, Match.kickoff, Match.id)
+    q = MATCHES.query(names, keys).filter(Match.season_id == season.id)
+    matchday = args.get("matchday", type=int)
+    if matchday:
+        q = q.filter(Match.matchday == matchday)
+    rows, pagination = _paginate(q, keys, args)
+    return {
+        "season": season.name,
+        "matches": MATCHES.serialize(names, rows, keys),
+        **pagination,
     }
-    return jsonify(data)
 
 
-@api_bp.route("/matches")
-def matches():
-    """GET /api/matches - Matches list by season and matchday."""
+def _leaderboards_data(args) -> dict:
+    season_id = args.get("season_id", type=int)
+    season = Season.query.get_or_404(season_id) if season_id else _get_current_season()
+    if not season:
+        return {"season": None, "leaderboards": {}}
+
+    boards = LeaderboardService.leaderboards(season.id)
+    return {
+        "season": season.name,
+        "season_id": season.id,
+        "leaderboards": {
+            name: [
+                {
+                    "rank": rank,
+                    "player_id": s.player_id,
+                    "full_name": s.full_name,
+                    "team_id": s.team_id,
+                    "team_name": s.team.name,
+                    "goals": s.goals,
+                    "assists": s.assists,
+                    "clean_sheets": s.clean_sheets,
+                    "yellow_cards": s.yellow_cards,
+                    "red_cards": s.red_cards,
+                    "appearances": s.appearances,
+                }
+                for rank, s in enumerate(rows, start=1)
+            ]
+            for name, rows in boards.items()
+        },
+    }
+
+
+def _projections_data(args) -> dict:
     season = _get_current_season()
     if not season:
-        return jsonify({"season": None, "matches": []})
+        return {"season": None, "teams": []}
 
-    q = Match.query.filter_by(season_id=season.id).order_by(Match.matchday, Match.kickoff)
-    matchday = request.args.get("matchday", type=int)
-    if matchday:
-        q = q.filter_by(matchday=matchday)
+    try:
+        from app.services.projection_service import ProjectionService
+    except ImportError:
+        raise ApiError("Projections require numpy.", 503) from None
 
-    page = request.args.get("page", 1, type=int)
-    per_page = min(request.args.get("per_page", 20, type=int), 100)
-    pagination = q.paginate(page=page, per_page=per_page, error_out=False)
+    projection = ProjectionService.project_season(season.id)
 
-    data = {
+    names = _team_names()
+    return {
         "season": season.name,
-        "matches": [
-            {
-                "id": m.id,
-                "matchday": m.matchday,
-                "kickoff": m.kickoff.isoformat() if m.kickoff else None,
-                "home_team_id": m.home_team_id,
-                "home_team_name": m.home_team.name,
-                "away_team_id": m.away_team_id,
-                "away_team_name": m.away_team.name,
-                "home_goals": m.home_goals,
-                "away_goals": m.away_goals,
-                "is_played": m.is_played,
-                "score_display": m.score_display,
-            }
-            for m in pagination.items
+        "season_id": season.id,
+        **projection,
+        "teams": [
+            {**t, "team_name": names.get(t["team_id"])}
+            for t in projection["teams"]
         ],
-        "total": pagination.total,
-        "page": page,
-        "per_page": per_page,
-        "pages": pagination.pages,
     }
-    return jsonify(data)
+
+
+@api_bp.route("/table")
+@cached_response(conditional=True)
+def table():
+    """
+    GET /api/table - League standings as JSON. ?matchday=N for the table
+    after round N; ?fields=position,team_name,... for a subset of columns.
+    """
+    return jsonify(_table_data(request.args))
+
+
+@api_bp.route("/teams/<int:team_id>/history")
+@cached_response(season_arg="season_id", conditional=True)
+def team_history(team_id):
+    """GET /api/teams/<id>/history - Position after each matchday (?season_id=, default current)."""
+    return jsonify(_team_history_data(request.args, team_id))
+
+
+@api_bp.route("/teams")
+@cached_response(all_seasons=True, conditional=True)
+def teams():
+    """GET /api/teams - Teams list with optional search, pagination and ?fields=."""
+    return jsonify(_teams_data(request.args))
+
+
+@api_bp.route("/players")
+@cached_response(all_seasons=True, conditional=True)
+def players():
+    """GET /api/players - Players list with search, pagination and ?fields=."""
+    return jsonify(_players_data(request.args))
+
+
+@api_bp.route("/matches")
+@cached_response(conditional=True)
+def matches():
+    """GET /api/matches - Matches list by season and matchday (?fields= for a subset)."""
+    return jsonify(_matches_data(request.args))
+
+
+@api_bp.route("/leaderboards")
+@cached_response(season_arg="season_id", conditional=True)
+def leaderboards():
+    """GET /api/leaderboards - Season top 10s (?season_id=, default current)."""
+    return jsonify(_leaderboards_data(request.args))
+
+
+@api_bp.route("/projections")
+def projections():
+    """GET /api/projections - Monte Carlo final position probabilities."""
+    return jsonify(_projections_data(request.args))
+
+
+@api_bp.route("/stream")
+def stream():
+    """GET /api/stream - Server-Sent Events: table snapshot, then standings/score deltas."""
+    from app.services.live_service import get_hub
+
+    hub = get_hub(current_app._get_current_object())
+    subscriber = hub.subscribe()
+    if subscriber is None:
+        return jsonify({"error": "Too many live connections, try again later."}), 503
+    try:
+        first = hub.snapshot()
+    except Exception:
+        hub.unsubscribe(subscriber)
+        raise
+    finally:
+        db.session.remove()  # The stream itself never queries; free the connection
+    heartbeat = current_app.config.get("LIVE_HEARTBEAT", 15)
+
+    def events():
+        try:
+            yield "retry: 5000\n\n"
+            yield first
+            while not subscriber.closed:
+                try:
+                    yield subscriber.events.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+        finally:
+            hub.unsubscribe(subscriber)
+
+    response = Response(events(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"  # Don't let nginx buffer the stream
+    return response
+
+
+@api_bp.route("/export/<dataset>")
+def export(dataset):
+    """
+    GET /api/export/<players|matches|events|standings> - Full dump in one
+    streamed response (?format=ndjson|csv, ?season_id= to limit to a season).
+    """
+    if dataset not in ExportService.datasets():
+        return jsonify({"error": f"Unknown dataset. Choose from: {', '.join(ExportService.datasets())}."}), 404
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in ExportService.FORMATS:
+        return jsonify({"error": "format must be ndjson or csv."}), 400
+    season_id = request.args.get("season_id", type=int)
+
+    chunks = ExportService.stream(dataset, fmt, season_id)
+    response = Response(stream_with_context(chunks), mimetype=ExportService.FORMATS[fmt])
+    filename = f"{dataset}-season-{season_id}" if season_id else dataset
+    response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+# Endpoints /api/batch may run: endpoint -> (view helper, season_arg, all_seasons),
+# mirroring each route's cached_response options (projections are not cached)
+BATCH_ENDPOINTS = {
+    "api.table": (_table_data, None, False),
+    "api.team_history": (_team_history_data, "season_id", False),
+    "api.teams": (_teams_data, None, True),
+    "api.players": (_players_data, None, True),
+    "api.matches": (_matches_data, None, False),
+    "api.leaderboards": (_leaderboards_data, "season_id", False),
+    "api.projections": (_projections_data, None, None),
+}
+
+
+@api_bp.route("/batch", methods=["GET", "POST"])
+@csrf.exempt
+def batch():
+    """
+    GET /api/batch?r=/api/table&r=/api/matches?matchday=3, or POST
+    {"requests": ["/api/table", {"path": "/api/players?team_id=4", "etag": "..."}]}.
+    Runs each item through its endpoint's view helper in this app context
+    and DB session (the current season and data versions are looked up
+    once) and returns {"responses": [{"path", "status", "etag", "body"}]}.
+    Items are cached individually and their etag matches the endpoint's
+    own ETag; a matching etag gets a 304 with a null body once the item
+    is known to exist (cached, or its helper ran without an error).
+    """
+    if request.method == "POST":
+        items = (request.get_json(silent=True) or {}).get("requests")
+    else:
+        items = request.args.getlist("r")
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "Send a list of API paths (?r=... or {\"requests\": [...]})."}), 400
+    limit = current_app.config["API_BATCH_MAX_REQUESTS"]
+    if len(items) > limit:
+        return jsonify({"error": f"At most {limit} requests per batch."}), 400
+
+    responses = []
+    adapter = current_app.url_map.bind_to_environ(request.environ)
+    for item in items:
+        path, etag = (item.get("path"), item.get("etag")) if isinstance(item, dict) else (item, None)
+        if not isinstance(path, str) or not path.startswith("/api/"):
+            return jsonify({"error": f"Not an API path: {path!r}."}), 400
+        status, response_etag, body = _run_batch_item(adapter, path, etag)
+        responses.append({"path": path, "status": status, "etag": response_etag, "body": body})
+    return jsonify({"responses": responses})
+
+
+def _run_batch_item(adapter, path: str, etag: str | None) -> tuple:
+    """
+    Run one batch item through its view helper, using the same cache key
+    as the endpoint itself.
+
+    Returns:
+        (status, etag or None, body dict or None)
+    """
+    parts = urlsplit(path)
+    try:
+        endpoint, view_args = adapter.match(parts.path, method="GET")
+    except HTTPException:
+        endpoint, view_args = None, {}
+    if endpoint not in BATCH_ENDPOINTS:
+        return 404, None, {"error": "Not a batchable endpoint."}
+    helper, season_arg, all_seasons = BATCH_ENDPOINTS[endpoint]
+    args = ImmutableMultiDict(parse_qsl(parts.query, keep_blank_values=True))
+
+    try:
+        if all_seasons is None:
+            return 200, None, helper(args, **view_args)
+
+        season_id = args.get(season_arg, type=int) if season_arg else None
+        key, _ = CacheService.key_for(endpoint, view_args, args, season_id, all_seasons)
+        body = CacheService.get(f"{key}.data")
+        if body is None:
+            body = helper(args, **view_args)
+            CacheService.set(f"{key}.data", body)
+        if etag == key:
+            return 304, key, None
+        return 200, key, body
+    except ApiError as e:
+        return e.status, None, {"error": e.message}
+    except HTTPException as e:
+        return e.code, None, {"error": e.description}
@@ -11,12 +11,14 @@ from flask import (
     request,
     current_app,
     abort,
+    jsonify,
 )
 from flask_login import login_required, current_user
 
 from app.blueprints.admin import admin_bp
 from app.extensions import db
 from sqlalchemy import or_
+from sqlalchemy.orm import contains_eager
 from app.models import (
     User,
     Role,
@@ -32,10 +34,28 @@ from app.models import (
 )
 from app.decorators import admin_required, stats_manager_required
 from app.services.match_service import MatchService
-from app.services.visitor_service import get_visitor_stats
+from app.services.cache_service import CacheService
+from app.services.pagination_service import PaginationService
+from app.services.visitor_service import get_visitor_stats, get_visit_timeseries, ALL_PAGES
 from app.utils import allowed_file, upload_image
 
 
+def _paginate(q, keys: tuple, descending: bool = False):
+    """Cursor page of a list (?cursor=, or ?page= for old links) with a cached total."""
+    try:
+        return PaginationService.paginate(
+            q,
+            keys,
+            current_app.config["ITEMS_PER_PAGE"],
+            cursor=request.args.get("cursor") or None,
+            page=request.args.get("page", 1, type=int),
+            descending=descending,
+            with_total=True,
+        )
+    except ValueError:
+        abort(400)
+
+
 # --- Dashboard ---
 
 
@@ -54,6 +74,30 @@ def analytics():
     return render_template("admin/analytics.html", stats=stats)
 
 
+@admin_bp.route("/cache-stats")
+@admin_required
+def cache_stats():
+    """Response cache hit/miss metrics for this worker (JSON)."""
+    return jsonify(CacheService.stats())
+
+
+@admin_bp.route("/analytics/timeseries")
+@admin_required
+def analytics_timeseries():
+    """Visits per hour or day from the rollup tables (JSON)."""
+    granularity = request.args.get("granularity", "day")
+    if granularity not in ("hour", "day"):
+        abort(400)
+    default_periods, max_periods = (48, 24 * 31) if granularity == "hour" else (30, 366)
+    periods = min(max(request.args.get("periods", default_periods, type=int), 1), max_periods)
+    page = request.args.get("page", ALL_PAGES)
+    return jsonify({
+        "granularity": granularity,
+        "page": page,
+        "series": get_visit_timeseries(granularity, page, periods),
+    })
+
+
 # --- Seasons ---
 
 
@@ -85,6 +129,7 @@ def add_season():
                 for s in Season.query.all():
                     s.is_active = False
             db.session.add(season)
+            CacheService.bump()  # The current season may have changed
             db.session.commit()
             _audit("create", "Season", season.id, f"Created season {name}")
             flash("Season added.", "success")
@@ -106,12 +151,7 @@ def teams():
         q = q.filter(
             or_(Team.name.ilike(f"%{search}%"), Team.short_name.ilike(f"%{search}%"))
         )
-    page = request.args.get("page", 1, type=int)
-    teams = q.order_by(Team.name).paginate(
-        page=page,
-        per_page=current_app.config["ITEMS_PER_PAGE"],
-        error_out=False,
-    )
+    teams = _paginate(q, (Team.name, Team.id))
     return render_template("admin/teams.html", teams=teams, search=search)
 
 
@@ -143,6 +183,7 @@ def add_team():
                 if url_or_fn:
                     team.logo_filename = url_or_fn
 
+            CacheService.bump()
             db.session.commit()
             _audit("create", "Team", team.id, f"Added team {name}")
             flash("Team added.", "success")
@@ -170,6 +211,7 @@ def edit_team(team_id):
             if url_or_fn:
                 team.logo_filename = url_or_fn
 
+        CacheService.bump()
         db.session.commit()
         _audit("update", "Team", team.id, f"Updated team {team.name}")
         flash("Team updated.", "success")
@@ -184,6 +226,7 @@ def delete_team(team_id):
     team = Team.query.get_or_404(team_id)
     name = team.name
     db.session.delete(team)
+    CacheService.bump()
     db.session.commit()
     _audit("delete", "Team", team_id, f"Deleted team {name}")
     flash("Team deleted.", "success")
@@ -197,7 +240,7 @@ def delete_team(team_id):
 @admin_required
 def players():
     """List players with search."""
-    q = Player.query.join(Team)
+    q = Player.query.join(Player.team).options(contains_eager(Player.team))
     search = request.args.get("q", "").strip()
     if search:
         q = q.filter(
@@ -207,12 +250,7 @@ def players():
                 Team.name.ilike(f"%{search}%"),
             )
         )
-    page = request.args.get("page", 1, type=int)
-    players = q.order_by(Player.last_name).paginate(
-        page=page,
-        per_page=current_app.config["ITEMS_PER_PAGE"],
-        error_out=False,
-    )
+    players = _paginate(q, (Player.last_name, Player.id))
     return render_template("admin/players.html", players=players, search=search)
 
 
@@ -248,6 +286,7 @@ def add_player():
                 if url_or_fn:
                     player.photo_filename = url_or_fn
 
+            CacheService.bump()
             db.session.commit()
             _audit("create", "Player", player.id, f"Registered {player.full_name}")
             flash("Player registered.", "success")
@@ -278,6 +317,7 @@ def edit_player(player_id):
             if url_or_fn:
                 player.photo_filename = url_or_fn
 
+        CacheService.bump()
         db.session.commit()
         _audit("update", "Player", player.id, f"Updated {player.full_name}")
         flash("Player updated.", "success")
@@ -340,6 +380,7 @@ def add_fixture():
                 kickoff=kickoff,
             )
             db.session.add(match)
+            CacheService.bump(season_id)
             db.session.commit()
             _audit("create", "Match", match.id, f"Scheduled fixture {matchday}")
             flash("Fixture scheduled.", "success")
@@ -383,7 +424,10 @@ def edit_fixture(match_id):
             
             kickoff = datetime.strptime(kickoff_str, "%Y-%m-%dT%H:%M")
             
-            # Update match details
+            # Update match details (invalidate both seasons if it moved)
+            CacheService.bump(match.season_id)
+            if season_id != match.season_id:
+                CacheService.bump(season_id)
             match.season_id = season_id
             match.matchday = matchday
             match.home_team_id = home_team_id
@@ -499,12 +543,7 @@ def gallery():
     if category:
         q = q.filter_by(category=category)
     
-    page = request.args.get("page", 1, type=int)
-    galleries = q.order_by(Gallery.created_at.desc()).paginate(
-        page=page,
-        per_page=current_app.config["ITEMS_PER_PAGE"],
-        error_out=False,
-    )
+    galleries = _paginate(q, (Gallery.created_at, Gallery.id), descending=True)
     
     # Get categories for filter
     categories = db.session.query(Gallery.category).distinct().all()
@@ -610,7 +649,6 @@ def delete_gallery(gallery_id):
 @admin_required
 def fan_comments():
     """Manage fan comments."""
-    page = request.args.get("page", 1, type=int)
     search = request.args.get("q", "").strip()
     
     q = FanComment.query
@@ -624,11 +662,7 @@ def fan_comments():
             )
         )
     
-    comments = q.order_by(FanComment.created_at.desc()).paginate(
-        page=page,
-        per_page=current_app.config["ITEMS_PER_PAGE"],
-        error_out=False,
-    )
+    comments = _paginate(q, (FanComment.created_at, FanComment.id), descending=True)
     
     return render_template(
         "admin/fan_comments.html",
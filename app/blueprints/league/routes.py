@@ -4,13 +4,15 @@ League routes - table, statistics, season selector.
 
 from datetime import date
 from flask import render_template, request
-from sqlalchemy import desc
 
 from app.blueprints.league import league_bp
+from app.decorators import cached_response
 from app.models import Season, Standing, Team, Player, Match
+from app.services.leaderboard_service import LeaderboardService
 
 
 @league_bp.route("/table")
+@cached_response(anonymous_only=True)
 def table():
     """League table page."""
     season = _get_current_season()
@@ -29,54 +31,25 @@ def table():
 
 
 @league_bp.route("/statistics")
+@cached_response(season_arg="season_id", anonymous_only=True)
 def statistics():
-    """Statistics page - top scorers, assists, etc."""
-    season = _get_current_season()
-    team_ids = [t.id for t in season.teams] if season else []
-
-    top_scorers = []
-    top_assists = []
-    clean_sheets = []
-    most_cards = []
-
-    if team_ids:
-        top_scorers = (
-            Player.query.filter(Player.team_id.in_(team_ids), Player.goals > 0)
-            .order_by(desc(Player.goals), desc(Player.assists))
-            .limit(10)
-            .all()
-        )
-        top_assists = (
-            Player.query.filter(Player.team_id.in_(team_ids), Player.assists > 0)
-            .order_by(desc(Player.assists), desc(Player.goals))
-            .limit(10)
-            .all()
-        )
-        clean_sheets = (
-            Player.query.filter(
-                Player.team_id.in_(team_ids),
-                Player.position.in_([Player.POSITION_GOALKEEPER, Player.POSITION_DEFENDER]),
-                Player.clean_sheets > 0,
-            )
-            .order_by(desc(Player.clean_sheets))
-            .limit(10)
-            .all()
-        )
-        most_cards = (
-            Player.query.filter(Player.team_id.in_(team_ids))
-            .filter((Player.yellow_cards + Player.red_cards * 2) > 0)
-            .order_by(desc(Player.yellow_cards + Player.red_cards * 2))
-            .limit(10)
-            .all()
-        )
+    """Statistics page - top scorers, assists, etc. (?season_id= for past seasons)."""
+    season_id = request.args.get("season_id", type=int)
+    season = Season.query.get_or_404(season_id) if season_id else _get_current_season()
+
+    boards = {
+        "top_scorers": [],
+        "top_assists": [],
+        "clean_sheets": [],
+        "most_cards": [],
+    }
+    if season:
+        boards = LeaderboardService.leaderboards(season.id)
 
     return render_template(
         "league/statistics.html",
         season=season,
-        top_scorers=top_scorers,
-        top_assists=top_assists,
-        clean_sheets=clean_sheets,
-        most_cards=most_cards,
+        **boards,
     )
 
 
@@ -4,10 +4,12 @@ Matches routes - fixtures list, match detail.
 
 from flask import render_template, request
 from app.blueprints.matches import matches_bp
+from app.decorators import cached_response
 from app.models import Match, MatchEvent, Season
 
 
 @matches_bp.route("/")
+@cached_response(anonymous_only=True)
 def list_matches():
     """Fixtures and results list."""
     season = Season.query.filter_by(is_active=True).first()
@@ -4,10 +4,12 @@ Teams routes - team profile, squad, stats.
 
 from flask import render_template, abort
 from app.blueprints.teams import teams_bp
+from app.decorators import cached_response
 from app.models import Team, Standing, Match, Season
 
 
 @teams_bp.route("/<int:team_id>")
+@cached_response(all_seasons=True, anonymous_only=True)
 def profile(team_id):
     """Team profile page with squad and stats."""
     team = Team.query.get_or_404(team_id)
@@ -42,8 +42,79 @@ class Config:
     CLOUDINARY_API_SECRET = None
     USE_CLOUDINARY = False
     
-    # Pagination
+    # Pagination (lists page by cursor; totals are counted at most once
+    # per PAGINATION_COUNT_TTL seconds per filter)
     ITEMS_PER_PAGE = 20
+    PAGINATION_COUNT_TTL = 60
+    API_BATCH_MAX_REQUESTS = 10  # Sub-requests per /api/batch call
+
+    # JSON encoder for responses: "auto" (orjson if installed), "orjson" or "stdlib"
+    JSON_ENCODER = os.environ.get("JSON_ENCODER", "auto")
+
+    # Standings engine: "auto" (SQL aggregation where supported), "sql",
+    # "python" or "numpy" (vectorized, needs numpy installed)
+    STANDINGS_ENGINE = os.environ.get("STANDINGS_ENGINE", "auto")
+    # numpy has a fixed per-table overhead (~0.2 ms), so it only beats the Python
+    # loop from about 16-20 teams (scripts/benchmark_standings.py: 0.1x at 3
+    # teams, 0.6x at 10, 0.8-1.1x at 16-18, 1.2x at 20, 1.9x at 40, 2.0x at
+    # 100). With STANDINGS_ENGINE="numpy", smaller seasons use the Python loop.
+    STANDINGS_NUMPY_MIN_TEAMS = int(os.environ.get("STANDINGS_NUMPY_MIN_TEAMS", "20"))
+
+    # Standings/snapshot recompute after a result: "sync" (in the request),
+    # "thread" (in-process background thread) or "worker" (flask recompute-worker)
+    STANDINGS_RECOMPUTE = os.environ.get("STANDINGS_RECOMPUTE", "thread")
+    # A failed recompute is retried after RECOMPUTE_BACKOFF seconds, doubling
+    # up to RECOMPUTE_BACKOFF_MAX; after RECOMPUTE_MAX_ATTEMPTS the season is
+    # left until the next result or `flask recompute-worker --reset-failed`
+    RECOMPUTE_BACKOFF = 30
+    RECOMPUTE_BACKOFF_MAX = 3600
+    RECOMPUTE_MAX_ATTEMPTS = 5
+
+    # Season projections (Monte Carlo, needs numpy)
+    PROJECTION_SIMULATIONS = 10000  # Fixed server-side; clients cannot choose a count
+    PROJECTION_WORKERS = None  # Pool size; None = one per CPU core, 0 or 1 = in-process
+    RELEGATION_SPOTS = 3
+
+    # Visitor tracking: "buffered" (queued, flushed by a background thread in
+    # each worker) or "sync" (written in the request)
+    VISITOR_TRACKING = os.environ.get("VISITOR_TRACKING", "buffered")
+    VISITOR_QUEUE_SIZE = 10000  # Hits beyond this are dropped (and counted)
+    VISITOR_FLUSH_INTERVAL = 5.0  # Seconds between flushes
+    VISITOR_FLUSH_BATCH = 500  # Flush early once this many hits are queued
+    # Keep one visitors row per (ip, page); unique counts come from
+    # HyperLogLog sketches either way
+    VISITOR_RAW_ROWS = os.environ.get("VISITOR_RAW_ROWS", "1") != "0"
+    # Tracking policy: endpoints to track (None = all) and to skip, bots,
+    # and the fraction of hits recorded (each counted as 1/rate visits)
+    VISITOR_TRACK_ENDPOINTS = None
+    VISITOR_SKIP_ENDPOINTS = frozenset({"static", "team_logo", "player_photo", "gallery_image"})
+    VISITOR_TRACK_BOTS = False
+    VISITOR_SAMPLE_RATE = float(os.environ.get("VISITOR_SAMPLE_RATE", "1.0"))
+    # Raw hit log in monthly tables; compacted into the daily rollups and
+    # dropped after VISITOR_LOG_RETENTION_DAYS (flask compact-visit-log)
+    VISITOR_LOG = os.environ.get("VISITOR_LOG", "1") != "0"
+    VISITOR_LOG_RETENTION_DAYS = int(os.environ.get("VISITOR_LOG_RETENTION_DAYS", "90"))
+
+    # Response cache for public pages and the API: "memory" (per worker),
+    # "filesystem" (shared by all workers on the host) or "null" (off)
+    CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "memory")
+    CACHE_DIR = os.environ.get("CACHE_DIR", str(BASE_DIR / "cache"))
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_TTL = 3600  # Safety net; entries are invalidated by data version
+
+    # Live updates (/api/stream): hubs poll the season version every
+    # LIVE_POLL_INTERVAL seconds; LIVE_NOTIFY="postgres" adds LISTEN/NOTIFY
+    # (needs a direct connection, not a transaction-mode pooler)
+    LIVE_NOTIFY = os.environ.get("LIVE_NOTIFY", "poll")
+    LIVE_POLL_INTERVAL = 2.0
+    LIVE_HEARTBEAT = 15  # Seconds between keepalive comments
+    # Each stream holds one gunicorn thread, so streams are capped per worker
+    # below the thread count, keeping LIVE_RESERVED_THREADS for other requests
+    # (workers x LIVE_MAX_CONNECTIONS clients in total)
+    WORKER_THREADS = int(os.environ.get("GUNICORN_THREADS", "64"))  # As in gunicorn_config.py
+    LIVE_RESERVED_THREADS = 16
+    LIVE_MAX_CONNECTIONS = max(1, WORKER_THREADS - LIVE_RESERVED_THREADS)  # Per worker process
+    LIVE_QUEUE_SIZE = 100  # Pending events per client before it is dropped
     
     # Session
     SESSION_COOKIE_SECURE = True
@@ -93,6 +164,16 @@ class ProductionConfig(Config):
     if _db_url and _db_url.startswith("postgres://"):
         _db_url = _db_url.replace("postgres://", "postgresql://", 1)
     SQLALCHEMY_DATABASE_URI = _db_url or ""
+    # Any request thread may need a connection, plus the background threads
+    # (live hub and its LISTEN connection, visit flusher, standings recompute);
+    # streams release theirs after the first snapshot. A small steady pool
+    # overflows up to one connection per thread: budget workers x (threads + 4)
+    # server connections, or put a session pooler in front.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        **Config.SQLALCHEMY_ENGINE_OPTIONS,
+        "pool_size": 10,
+        "max_overflow": max(0, Config.WORKER_THREADS + 4 - 10),
+    }
 
 
 class TestingConfig(Config):
@@ -103,6 +184,9 @@ class TestingConfig(Config):
     ENV = "testing"
     
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    STANDINGS_RECOMPUTE = "sync"
+    VISITOR_TRACKING = "sync"
+    CACHE_BACKEND = "null"
     WTF_CSRF_ENABLED = False
     SECRET_KEY = "test-secret-key"
 
@@ -1,9 +1,10 @@
 """
-Custom decorators for role-based access control.
+Custom decorators for role-based access control and response caching.
 """
 
+from datetime import timezone
 from functools import wraps
-from flask import abort
+from flask import abort, make_response, request, session
 from flask_login import current_user
 
 
@@ -39,3 +40,73 @@ def login_required(f):
             abort(401)
         return f(*args, **kwargs)
     return decorated
+
+
+def cached_response(season_arg=None, all_seasons=False, anonymous_only=False, conditional=False):
+    """
+    Cache a GET view's response, keyed by route, arguments and the season's
+    data version (see CacheService). season_arg names a query parameter
+    that selects the season (default: current season); all_seasons keys on
+    every season's version instead. anonymous_only is for HTML pages whose
+    layout shows the user or flashed messages.
+
+    With conditional, responses carry a strong ETag (the cache key) and
+    Last-Modified (the season's last data change), and a matching
+    If-None-Match / If-Modified-Since gets a 304 once a cached (or freshly
+    rendered) 200 exists for the key. Cached entries keep the view's
+    response headers, so a hit replays them.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            from app.services.cache_service import CacheService
+
+            if request.method != "GET" or (
+                anonymous_only and (current_user.is_authenticated or session.get("_flashes"))
+            ):
+                CacheService.record_bypass()
+                return f(*args, **kwargs)
+
+            season_id = request.args.get(season_arg, type=int) if season_arg else None
+            key, updated_at = CacheService.response_key(season_id, all_seasons)
+            last_modified = updated_at.replace(tzinfo=timezone.utc, microsecond=0) if updated_at else None
+
+            cached = CacheService.get(f"{key}.response")
+            if cached is not None:
+                body, status, headers = cached
+                response = make_response(body, status, headers)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code == 200 and not response.direct_passthrough:
+                    headers = [(k, v) for k, v in response.headers if k not in _UNCACHED_HEADERS]
+                    CacheService.set(f"{key}.response", (response.get_data(), response.status_code, headers))
+
+            # Only a 200 (cached or just rendered) is "not modified"; a URL
+            # that 404s keeps answering 404 whatever validators are sent
+            if conditional and response.status_code == 200 and _not_modified(key, last_modified):
+                response = make_response("", 304)
+            if conditional and response.status_code in (200, 304):
+                _set_validators(response, key, last_modified)
+            return response
+        return decorated
+    return decorator
+
+
+# Recomputed per response, or must never be shared between clients
+_UNCACHED_HEADERS = {"Content-Length", "Set-Cookie", "Date"}
+
+
+def _not_modified(etag, last_modified):
+    """Whether the request's validators match (If-None-Match wins over If-Modified-Since)."""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    since = request.if_modified_since
+    return bool(since and last_modified and last_modified <= since)
+
+
+def _set_validators(response, etag, last_modified):
+    """ETag/Last-Modified plus no-cache, so clients revalidate on every poll."""
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
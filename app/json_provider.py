@@ -0,0 +1,51 @@
+"""
+JSON provider - encodes responses with orjson when it is installed
+(JSON_ENCODER="auto" or "orjson"), otherwise with Flask's stdlib provider.
+Output matches the default provider: sorted keys, HTTP dates for datetimes,
+indented in debug. Optional: requires orjson.
+"""
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson for dumps/loads and response bodies."""
+
+    def __init__(self, app):
+        super().__init__(app)
+        encoder = app.config.get("JSON_ENCODER", "auto")
+        if encoder == "orjson" and orjson is None:
+            raise RuntimeError("JSON_ENCODER=orjson but orjson is not installed.")
+        self.fast = orjson is not None and encoder != "stdlib"
+
+    def _options(self, indent: bool = False) -> int:
+        # Datetimes go through self.default (HTTP date) like the stdlib provider
+        options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if indent:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj, **kwargs) -> str:
+        if not self.fast or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if not self.fast or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if not self.fast:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -4,27 +4,37 @@ Database models - central export for all model classes.
 
 from app.models.user import User, Role
 from app.models.season import Season
+from app.models.data_version import DataVersion
 from app.models.team import Team
 from app.models.player import Player
+from app.models.player_season_stats import PlayerSeasonStats
 from app.models.match import Match
 from app.models.match_event import MatchEvent
 from app.models.standing import Standing
+from app.models.standing_snapshot import StandingSnapshot
 from app.models.audit_log import AuditLog
 from app.models.gallery import Gallery
 from app.models.fan_comment import FanComment
 from app.models.visitor import Visitor
+from app.models.visit_rollup import HourlyVisitRollup, DailyVisitRollup, VisitSketch
 
 __all__ = [
     "User",
     "Role",
     "Season",
+    "DataVersion",
     "Team",
     "Player",
+    "PlayerSeasonStats",
     "Match",
     "MatchEvent",
     "Standing",
+    "StandingSnapshot",
     "AuditLog",
     "Gallery",
     "FanComment",
     "Visitor",
+    "HourlyVisitRollup",
+    "DailyVisitRollup",
+    "VisitSketch",
 ]
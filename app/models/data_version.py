@@ -0,0 +1,33 @@
+"""
+DataVersion model - site-wide version of the public data.
+"""
+
+from app.extensions import db
+
+
+class DataVersion(db.Model):
+    """
+    Single row bumped by every public-data write (CacheService.bump), whatever
+    the season. Keys cached pages not tied to one season, and keeps working
+    before any season exists.
+    """
+
+    __tablename__ = "data_version"
+
+    ROW_ID = 1
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime)  # Time of the last bump (Last-Modified)
+
+    def __repr__(self):
+        return f"<DataVersion {self.version}>"
+
+
+# The row exists from the start (create_all here, the migration in production),
+# so bumps are a plain UPDATE
+db.event.listen(
+    DataVersion.__table__,
+    "after_create",
+    db.DDL(f"INSERT INTO data_version (id, version) VALUES ({DataVersion.ROW_ID}, 0)"),
+)
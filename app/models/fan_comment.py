@@ -16,8 +16,13 @@ class FanComment(db.Model):
     nickname = db.Column(db.String(100))  # Optional nickname
     comment = db.Column(db.Text, nullable=False)
     is_approved = db.Column(db.Boolean, default=True)  # Auto-approve, can be moderated
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Newest-first list order (keyset pagination)
+    __table_args__ = (
+        db.Index('ix_fan_comments_created_at_id', 'created_at', 'id'),
+    )
     
     def __repr__(self):
         return f'<FanComment {self.name}: {self.comment[:50]}...>'
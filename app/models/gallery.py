@@ -18,8 +18,13 @@ class Gallery(db.Model):
     category = db.Column(db.String(50), nullable=False, default='highlight')  # highlight, story, event
     match_id = db.Column(db.Integer, db.ForeignKey('matches.id'), nullable=True)
     is_featured = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Newest-first list order (keyset pagination)
+    __table_args__ = (
+        db.Index('ix_galleries_created_at_id', 'created_at', 'id'),
+    )
     
     # Relationships
     match = db.relationship('Match', backref='galleries')
@@ -38,6 +38,11 @@ class Match(db.Model):
         lazy="dynamic",
         order_by="MatchEvent.minute",
     )
+
+    # Fixture list order within a season (keyset pagination)
+    __table_args__ = (
+        db.Index("ix_matches_season_order", "season_id", "matchday", "kickoff", "id"),
+    )
     
     @property
     def score_display1(self):
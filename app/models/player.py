@@ -51,6 +51,11 @@ class Player(db.Model):
         back_populates="assist",
         lazy="dynamic",
     )
+
+    # List order (keyset pagination)
+    __table_args__ = (
+        db.Index("ix_players_last_name_id", "last_name", "id"),
+    )
     
     @property
     def full_name(self):
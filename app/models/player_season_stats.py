@@ -0,0 +1,47 @@
+"""
+PlayerSeasonStats model - a player's stats for one season and team.
+"""
+
+from app.extensions import db
+
+
+class PlayerSeasonStats(db.Model):
+    """
+    Per-season player stats, derived from match events by the match service.
+    Keyed by team too, so a transferred player keeps separate rows per club.
+    """
+
+    __tablename__ = "player_season_stats"
+
+    player_id = db.Column(db.Integer, db.ForeignKey("players.id"), primary_key=True)
+    season_id = db.Column(db.Integer, db.ForeignKey("seasons.id"), primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey("teams.id"), primary_key=True)
+
+    goals = db.Column(db.Integer, default=0, nullable=False)
+    assists = db.Column(db.Integer, default=0, nullable=False)
+    yellow_cards = db.Column(db.Integer, default=0, nullable=False)
+    red_cards = db.Column(db.Integer, default=0, nullable=False)
+    appearances = db.Column(db.Integer, default=0, nullable=False)
+    clean_sheets = db.Column(db.Integer, default=0, nullable=False)
+    # yellow_cards + red_cards * 2, stored so the cards leaderboard can use an index
+    discipline_points = db.Column(db.Integer, default=0, nullable=False)
+
+    # Relationships
+    player = db.relationship("Player")
+    team = db.relationship("Team")
+
+    # One index per leaderboard: WHERE season_id = ? ORDER BY <stat> DESC LIMIT 10
+    __table_args__ = (
+        db.Index("ix_player_season_stats_goals", "season_id", "goals", "assists"),
+        db.Index("ix_player_season_stats_assists", "season_id", "assists", "goals"),
+        db.Index("ix_player_season_stats_clean_sheets", "season_id", "clean_sheets"),
+        db.Index("ix_player_season_stats_discipline", "season_id", "discipline_points"),
+    )
+
+    @property
+    def full_name(self):
+        """Player's full name."""
+        return self.player.full_name
+
+    def __repr__(self):
+        return f"<PlayerSeasonStats {self.player_id} S{self.season_id} T{self.team_id}>"
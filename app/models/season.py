@@ -16,6 +16,15 @@ class Season(db.Model):
     end_date = db.Column(db.Date, nullable=False)
     is_active = db.Column(db.Boolean, default=False, nullable=False)
     
+    # Derived-data recompute state (see RecomputeService)
+    standings_version = db.Column(db.Integer, default=0, nullable=False)  # Bumped per recompute
+    standings_dirty = db.Column(db.Boolean, default=False, nullable=False)  # Recompute pending
+    snapshots_dirty_from = db.Column(db.Integer)  # Earliest matchday needing new snapshots
+    recompute_failures = db.Column(db.Integer, default=0, nullable=False)  # Failed attempts since the last mark
+    recompute_retry_at = db.Column(db.DateTime)  # No retry before this time (backoff)
+    data_version = db.Column(db.Integer, default=0, nullable=False)  # Bumped on any public-data write (CacheService)
+    data_updated_at = db.Column(db.DateTime)  # Time of the last bump (Last-Modified)
+    
     # Relationships
     teams = db.relationship(
         "Team",
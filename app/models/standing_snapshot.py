@@ -0,0 +1,44 @@
+"""
+StandingSnapshot model - league table as it stood after a matchday.
+"""
+
+from app.extensions import db
+
+
+class StandingSnapshot(db.Model):
+    """
+    One team's table row after matchday N (only matches with matchday <= N counted).
+    Filled incrementally by the snapshot service; one row per team per matchday.
+    """
+
+    __tablename__ = "standing_snapshots"
+
+    # Composite key doubles as the "table as of matchday N" index
+    season_id = db.Column(db.Integer, db.ForeignKey("seasons.id"), primary_key=True)
+    matchday = db.Column(db.SmallInteger, primary_key=True)
+    team_id = db.Column(db.Integer, db.ForeignKey("teams.id"), primary_key=True)
+
+    position = db.Column(db.SmallInteger, nullable=False)
+    played = db.Column(db.SmallInteger, default=0, nullable=False)
+    won = db.Column(db.SmallInteger, default=0, nullable=False)
+    drawn = db.Column(db.SmallInteger, default=0, nullable=False)
+    lost = db.Column(db.SmallInteger, default=0, nullable=False)
+    goals_for = db.Column(db.SmallInteger, default=0, nullable=False)
+    goals_against = db.Column(db.SmallInteger, default=0, nullable=False)
+    points = db.Column(db.SmallInteger, default=0, nullable=False)
+
+    # Relationships
+    team = db.relationship("Team")
+
+    # Position history per team
+    __table_args__ = (
+        db.Index("ix_standing_snapshots_team_history", "season_id", "team_id", "matchday"),
+    )
+
+    @property
+    def goal_difference(self):
+        """Goals for minus goals against."""
+        return self.goals_for - self.goals_against
+
+    def __repr__(self):
+        return f"<StandingSnapshot MD{self.matchday} #{self.position} {self.team_id}>"
@@ -37,6 +37,11 @@ class Team(db.Model):
         back_populates="away_team",
         lazy="dynamic",
     )
+
+    # List order (keyset pagination)
+    __table_args__ = (
+        db.Index("ix_teams_name_id", "name", "id"),
+    )
     
     def __repr__(self):
         return f"<Team {self.name}>"
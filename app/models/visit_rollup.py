@@ -0,0 +1,72 @@
+"""
+Visit rollup models - pre-aggregated visitor analytics per hour and per day,
+plus HyperLogLog unique-visitor sketches.
+"""
+
+from datetime import date
+
+from app.extensions import db
+
+
+# page value for site-wide totals (all endpoints)
+ALL_PAGES = "*"
+
+# VisitSketch.day for the all-time sketch (kept so all-time uniques are one row)
+ALL_TIME = date(1970, 1, 1)
+
+
+class HourlyVisitRollup(db.Model):
+    """
+    Visits per hour and endpoint, maintained by the visitor flush.
+    The ALL_PAGES row holds site-wide totals, where unique means distinct IPs.
+    """
+
+    __tablename__ = "visit_rollups_hourly"
+
+    bucket = db.Column(db.DateTime, primary_key=True)  # Start of the hour (UTC)
+    page = db.Column(db.String(255), primary_key=True)
+    visits = db.Column(db.Integer, default=0, nullable=False)
+    unique_visitors = db.Column(db.Integer, default=0, nullable=False)
+    new_visitors = db.Column(db.Integer, default=0, nullable=False)  # First ever visit
+
+    __table_args__ = (
+        db.Index("ix_visit_rollups_hourly_page", "page", "bucket"),
+    )
+
+    def __repr__(self):
+        return f"<HourlyVisitRollup {self.bucket} {self.page}: {self.visits}>"
+
+
+class DailyVisitRollup(db.Model):
+    """Visits per day and endpoint (same columns as HourlyVisitRollup)."""
+
+    __tablename__ = "visit_rollups_daily"
+
+    bucket = db.Column(db.Date, primary_key=True)  # UTC day
+    page = db.Column(db.String(255), primary_key=True)
+    visits = db.Column(db.Integer, default=0, nullable=False)
+    unique_visitors = db.Column(db.Integer, default=0, nullable=False)
+    new_visitors = db.Column(db.Integer, default=0, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_visit_rollups_daily_page", "page", "bucket"),
+    )
+
+    def __repr__(self):
+        return f"<DailyVisitRollup {self.bucket} {self.page}: {self.visits}>"
+
+
+class VisitSketch(db.Model):
+    """
+    HyperLogLog sketch of visitor IPs for one day and endpoint (a few KB).
+    Sketches merge losslessly, so weekly or per-site counts union rows.
+    """
+
+    __tablename__ = "visit_sketches"
+
+    day = db.Column(db.Date, primary_key=True)  # UTC day, or ALL_TIME
+    page = db.Column(db.String(255), primary_key=True)
+    registers = db.Column(db.LargeBinary, nullable=False)  # HyperLogLog.to_bytes()
+
+    def __repr__(self):
+        return f"<VisitSketch {self.day} {self.page}>"
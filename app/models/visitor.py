@@ -12,13 +12,19 @@ class Visitor(db.Model):
     __tablename__ = "visitors"
     
     id = db.Column(db.Integer, primary_key=True)
-    ip_address = db.Column(db.String(45), nullable=False, index=True)
+    ip_address = db.Column(db.String(45), nullable=False)
     user_agent = db.Column(db.Text)
     page_visited = db.Column(db.String(255), nullable=False)
     first_visit = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    last_visit = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_visit = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     visit_count = db.Column(db.Integer, default=1, nullable=False)
     is_unique = db.Column(db.Boolean, default=True, nullable=False)
+
+    # One row per (ip, page): the tracker upserts against this index, and
+    # its ip_address prefix serves per-IP lookups
+    __table_args__ = (
+        db.Index("uq_visitors_ip_page", "ip_address", "page_visited", unique=True),
+    )
     
     @property
     def visit_frequency(self):
@@ -4,5 +4,7 @@ Services layer - business logic separated from routes.
 
 from app.services.standings_service import StandingsService
 from app.services.match_service import MatchService
+from app.services.snapshot_service import SnapshotService
+from app.services.leaderboard_service import LeaderboardService
 
-__all__ = ["StandingsService", "MatchService"]
+__all__ = ["StandingsService", "MatchService", "SnapshotService", "LeaderboardService"]
@@ -0,0 +1,293 @@
+"""
+Cache service - season-versioned response cache for public pages and the API.
+
+Cache keys combine the route, its arguments and the season's data_version
+(or the site-wide DataVersion row, for pages not tied to one season).
+Writes that change what a page shows bump both (bump() runs inside the
+writer's transaction), so old entries are simply never looked up again
+and age out of the backend. Backends: "null" (disabled), "memory"
+(in-process LRU) and "filesystem" (shared by every worker on the host).
+"""
+
+import hashlib
+import os
+import pickle
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from flask import current_app, g, request
+from sqlalchemy import update
+
+from app.extensions import db
+from app.models import Season, DataVersion
+
+
+class NullCache:
+    """Backend that stores nothing (CACHE_BACKEND=null)."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def clear(self):
+        pass
+
+    def __len__(self):
+        return 0
+
+
+class MemoryCache:
+    """Thread-safe in-process LRU with per-entry TTL."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (time.time() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class FileSystemCache:
+    """One pickle file per entry in a directory shared by all workers."""
+
+    PRUNE_EVERY = 256  # Sets between expiry sweeps
+
+    def __init__(self, directory: str, max_entries: int):
+        self.directory = directory
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.cache")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "rb") as f:
+                expires, value = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        if expires < time.time():
+            return None
+        return value
+
+    def set(self, key, value, ttl):
+        # Write to a temp file and rename, so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump((time.time() + ttl, value), f, pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(key))
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        if random.randrange(self.PRUNE_EVERY) == 0:
+            self._prune()
+
+    def _prune(self):
+        """Drop the oldest entries beyond max_entries (stale versions go first in practice)."""
+        try:
+            entries = [
+                e for e in os.scandir(self.directory) if e.name.endswith(".cache")
+            ]
+            entries.sort(key=lambda e: e.stat().st_mtime)
+            for entry in entries[:max(0, len(entries) - self.max_entries)]:
+                os.remove(entry.path)
+        except OSError:
+            pass
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".cache"):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def __len__(self):
+        return sum(1 for e in os.scandir(self.directory) if e.name.endswith(".cache"))
+
+
+class CacheService:
+    """Service for versioned response caching and its invalidation."""
+
+    # Per-process metrics, updated from every request thread
+    _stats = {"hits": 0, "misses": 0, "stores": 0, "bypassed": 0}
+    _stats_lock = threading.Lock()
+
+    @staticmethod
+    def bump(season_id: int | None = None) -> None:
+        """
+        Invalidate cached pages for a season, or for every season (team and
+        player edits show up in all of them). No commit - call inside the
+        writer's transaction so the new version becomes visible with the data.
+        """
+        now = datetime.utcnow()
+        stmt = update(Season).values(
+            data_version=Season.data_version + 1,
+            data_updated_at=now,
+        )
+        if season_id is not None:
+            stmt = stmt.where(Season.id == season_id)
+        db.session.execute(stmt)
+        db.session.execute(
+            update(DataVersion)
+            .where(DataVersion.id == DataVersion.ROW_ID)
+            .values(version=DataVersion.version + 1, updated_at=now)
+        )
+        g.pop("cache_versions", None)
+
+    @staticmethod
+    def version(season_id: int | None = None, all_seasons: bool = False) -> tuple:
+        """
+        Version token and last-modified time for a season, default the
+        current one (active, else latest). One primary-key or single-row
+        lookup. With all_seasons, the site-wide token, which changes on every
+        bump (for data not tied to one season, e.g. career player totals).
+        Memoized for the app context, so /api/batch looks each one up once.
+
+        Returns:
+            ("<season id>:<data_version>" or "all:<version>", last bump time or None)
+        """
+        versions = g.setdefault("cache_versions", {})
+        key = (season_id, all_seasons)
+        if key not in versions:
+            versions[key] = CacheService._load_version(season_id, all_seasons)
+        return versions[key]
+
+    @staticmethod
+    def _load_version(season_id: int | None, all_seasons: bool) -> tuple:
+        if all_seasons:
+            row = (
+                db.session.query(DataVersion.version, DataVersion.updated_at)
+                .filter(DataVersion.id == DataVersion.ROW_ID)
+                .first()
+            )
+            if row is None:
+                return "all:0", None
+            return f"all:{row.version}", row.updated_at
+        q = db.session.query(Season.id, Season.data_version, Season.data_updated_at)
+        if season_id is not None:
+            row = q.filter(Season.id == season_id).first()
+        else:
+            row = q.order_by(Season.is_active.desc(), Season.start_date.desc()).first()
+        if row is None:
+            return "none", None
+        return f"{row.id}:{row.data_version}", row.data_updated_at
+
+    @classmethod
+    def response_key(cls, season_id: int | None = None, all_seasons: bool = False) -> tuple:
+        """
+        Key for the current request: route, view args, query string and data version.
+
+        Returns:
+            (key, last modified time or None)
+        """
+        return cls.key_for(request.endpoint, request.view_args, request.args, season_id, all_seasons)
+
+    @classmethod
+    def key_for(
+        cls,
+        endpoint: str,
+        view_args: dict | None,
+        args,
+        season_id: int | None = None,
+        all_seasons: bool = False,
+    ) -> tuple:
+        """
+        Key for an endpoint called with view args and a query MultiDict
+        (response_key for requests that are not the current one, e.g. /api/batch items).
+
+        Returns:
+            (key, last modified time or None)
+        """
+        token, updated_at = cls.version(season_id, all_seasons)
+        parts = (
+            endpoint,
+            sorted((view_args or {}).items()),
+            sorted(args.items(multi=True)),
+            token,
+        )
+        return hashlib.sha1(repr(parts).encode()).hexdigest(), updated_at
+
+    @classmethod
+    def get(cls, key: str):
+        value = cls.backend().get(key)
+        cls._count("hits" if value is not None else "misses")
+        return value
+
+    @classmethod
+    def set(cls, key: str, value) -> None:
+        cls.backend().set(key, value, current_app.config.get("CACHE_TTL", 3600))
+        cls._count("stores")
+
+    @classmethod
+    def record_bypass(cls) -> None:
+        """Count a request that skipped the cache (e.g. logged-in user)."""
+        cls._count("bypassed")
+
+    @classmethod
+    def _count(cls, name: str) -> None:
+        # += on a shared dict is not atomic across gthread workers
+        with cls._stats_lock:
+            cls._stats[name] += 1
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Hit/miss counters for this process plus the backend's entry count."""
+        with cls._stats_lock:
+            counts = dict(cls._stats)
+        lookups = counts["hits"] + counts["misses"]
+        return {
+            **counts,
+            "hit_rate": round(counts["hits"] / lookups, 4) if lookups else None,
+            "backend": current_app.config.get("CACHE_BACKEND", "memory"),
+            "entries": len(cls.backend()),
+        }
+
+    @staticmethod
+    def backend():
+        """Configured backend, one per app instance (stored on app.extensions)."""
+        app = current_app._get_current_object()
+        backend = app.extensions.get("response_cache")
+        if backend is None:
+            kind = app.config.get("CACHE_BACKEND", "memory")
+            max_entries = app.config.get("CACHE_MAX_ENTRIES", 1024)
+            if kind == "filesystem":
+                backend = FileSystemCache(app.config["CACHE_DIR"], max_entries)
+            elif kind == "memory":
+                backend = MemoryCache(max_entries)
+            else:
+                backend = NullCache()
+            backend = app.extensions.setdefault("response_cache", backend)
+        return backend
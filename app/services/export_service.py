@@ -0,0 +1,190 @@
+"""
+Export service - bulk dumps of players, matches, events and standings.
+Rows come from column-only selects read through a server-side cursor
+(yield_per), and are encoded as NDJSON or CSV in chunks, so memory stays
+flat whatever the table size.
+"""
+
+import csv
+import io
+import json
+from datetime import date, datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app.extensions import db
+from app.models import Player, Team, Match, MatchEvent, Standing
+
+
+class ExportService:
+    """Service for streaming exports of league data."""
+
+    FORMATS = {
+        "ndjson": "application/x-ndjson",
+        "csv": "text/csv",
+    }
+    YIELD_PER = 1000  # Rows fetched from the cursor at a time
+    CHUNK_ROWS = 500  # Rows encoded per chunk written to the response
+
+    @classmethod
+    def datasets(cls) -> tuple:
+        return tuple(_STATEMENTS)
+
+    @classmethod
+    def statement(cls, dataset: str, season_id: int | None = None):
+        """
+        Column-only select for a dataset, optionally limited to one season
+        (players are current registrations and ignore season_id).
+
+        Raises:
+            KeyError: unknown dataset
+        """
+        stmt, season_column = _STATEMENTS[dataset]()
+        if season_id is not None and season_column is not None:
+            stmt = stmt.where(season_column == season_id)
+        return stmt
+
+    @classmethod
+    def stream(cls, dataset: str, fmt: str, season_id: int | None = None):
+        """
+        Generator of encoded chunks for a dataset (a header line first for CSV).
+        Run inside an app context for the whole iteration (stream_with_context).
+        """
+        stmt = cls.statement(dataset, season_id)
+        result = db.session.execute(stmt.execution_options(yield_per=cls.YIELD_PER))
+        columns = list(result.keys())
+        encode = _encode_csv if fmt == "csv" else _encode_ndjson
+        try:
+            if fmt == "csv":
+                yield encode(columns, [columns])
+            for rows in result.partitions(cls.CHUNK_ROWS):
+                yield encode(columns, rows)
+        finally:
+            result.close()
+
+
+def _players():
+    stmt = (
+        select(
+            Player.id,
+            Player.first_name,
+            Player.last_name,
+            Player.position,
+            Player.jersey_number,
+            Player.age,
+            Player.team_id,
+            Team.name.label("team_name"),
+            Player.goals,
+            Player.assists,
+            Player.yellow_cards,
+            Player.red_cards,
+            Player.appearances,
+            Player.clean_sheets,
+        )
+        .join(Team, Team.id == Player.team_id)
+        .order_by(Player.id)
+    )
+    return stmt, None
+
+
+def _matches():
+    home, away = aliased(Team), aliased(Team)
+    stmt = (
+        select(
+            Match.id,
+            Match.season_id,
+            Match.matchday,
+            Match.kickoff,
+            Match.home_team_id,
+            home.name.label("home_team_name"),
+            Match.away_team_id,
+            away.name.label("away_team_name"),
+            Match.home_goals,
+            Match.away_goals,
+            Match.is_played,
+            Match.played_at,
+        )
+        .join(home, home.id == Match.home_team_id)
+        .join(away, away.id == Match.away_team_id)
+        .order_by(Match.id)
+    )
+    return stmt, Match.season_id
+
+
+def _events():
+    stmt = (
+        select(
+            MatchEvent.id,
+            MatchEvent.match_id,
+            Match.season_id,
+            MatchEvent.event_type,
+            MatchEvent.minute,
+            MatchEvent.extra_time,
+            MatchEvent.player_id,
+            MatchEvent.goal_scorer_id,
+            MatchEvent.assist_id,
+            MatchEvent.player_off_id,
+            MatchEvent.player_on_id,
+            MatchEvent.is_penalty,
+            MatchEvent.is_own_goal,
+        )
+        .join(Match, Match.id == MatchEvent.match_id)
+        .order_by(MatchEvent.id)
+    )
+    return stmt, Match.season_id
+
+
+def _standings():
+    stmt = (
+        select(
+            Standing.season_id,
+            Standing.position,
+            Standing.team_id,
+            Team.name.label("team_name"),
+            Standing.played,
+            Standing.won,
+            Standing.drawn,
+            Standing.lost,
+            Standing.goals_for,
+            Standing.goals_against,
+            Standing.goal_difference,
+            Standing.points,
+            Standing.form,
+        )
+        .join(Team, Team.id == Standing.team_id)
+        .order_by(Standing.season_id, Standing.position)
+    )
+    return stmt, Standing.season_id
+
+
+# Dataset name -> builder returning (select, season column or None)
+_STATEMENTS = {
+    "players": _players,
+    "matches": _matches,
+    "events": _events,
+    "standings": _standings,
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _encode_ndjson(columns, rows) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default, separators=(",", ":")) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _encode_csv(columns, rows) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [v.isoformat() if isinstance(v, (datetime, date)) else v for v in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
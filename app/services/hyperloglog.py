@@ -0,0 +1,64 @@
+"""
+HyperLogLog - fixed-size probabilistic distinct counter.
+Used for unique-visitor counts: one sketch per day and endpoint, stored as a
+compressed blob and merged (register-wise max) across days and workers.
+"""
+
+import math
+import zlib
+from hashlib import blake2b
+
+
+DEFAULT_PRECISION = 12  # 4096 registers, ~1.6% standard error
+
+
+class HyperLogLog:
+    """HyperLogLog sketch with 64-bit hashes (no large-range correction needed)."""
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: bytes | None = None):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(self.size)
+        if len(self.registers) != self.size:
+            raise ValueError("register count does not match precision")
+
+    def add(self, value: str) -> None:
+        """Add a value (e.g. an IP address)."""
+        x = int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), "big")
+        bits = 64 - self.precision
+        index = x >> bits
+        rank = bits - (x & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Fold another sketch into this one (union) and return self."""
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches with different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        """Estimated number of distinct values added."""
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small range: linear counting is more accurate
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """Compact blob: precision byte + zlib-compressed registers."""
+        return bytes([self.precision]) + zlib.compress(bytes(self.registers))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        """Inverse of to_bytes."""
+        return cls(data[0], zlib.decompress(data[1:]))
+
+    def __len__(self):
+        return self.count()
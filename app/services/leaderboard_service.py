@@ -0,0 +1,54 @@
+"""
+Leaderboard service - per-season top players read from PlayerSeasonStats.
+Each board is WHERE season_id = ? ORDER BY <stat> DESC LIMIT n on its own index.
+"""
+
+from sqlalchemy import desc
+from sqlalchemy.orm import joinedload
+
+from app.models import PlayerSeasonStats
+
+
+class LeaderboardService:
+    """Service for season leaderboards (scorers, assists, clean sheets, cards)."""
+
+    LIMIT = 10
+
+    @classmethod
+    def leaderboards(cls, season_id: int, limit: int | None = None) -> dict:
+        """
+        Top players per stat for a season.
+
+        Returns:
+            Dict of board name -> list of PlayerSeasonStats (player and team loaded)
+        """
+        limit = limit or cls.LIMIT
+        s = PlayerSeasonStats
+        return {
+            "top_scorers": cls._board(
+                season_id, s.goals > 0, (desc(s.goals), desc(s.assists)), limit
+            ),
+            "top_assists": cls._board(
+                season_id, s.assists > 0, (desc(s.assists), desc(s.goals)), limit
+            ),
+            "clean_sheets": cls._board(
+                season_id, s.clean_sheets > 0, (desc(s.clean_sheets),), limit
+            ),
+            "most_cards": cls._board(
+                season_id, s.discipline_points > 0, (desc(s.discipline_points),), limit
+            ),
+        }
+
+    @staticmethod
+    def _board(season_id: int, condition, order_by: tuple, limit: int) -> list:
+        """One leaderboard query with player and team eager-loaded."""
+        return (
+            PlayerSeasonStats.query.options(
+                joinedload(PlayerSeasonStats.player),
+                joinedload(PlayerSeasonStats.team),
+            )
+            .filter(PlayerSeasonStats.season_id == season_id, condition)
+            .order_by(*order_by)
+            .limit(limit)
+            .all()
+        )
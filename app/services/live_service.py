@@ -0,0 +1,290 @@
+"""
+Live service - Server-Sent Events fan-out for table and score updates.
+
+Each worker process runs one LiveHub: a background thread that notices
+when the current season's data_version changes, diffs the standings and
+newly played matches against what it last sent, and pushes the compact
+deltas to every connected /api/stream client through per-client queues.
+Connections never touch the database; a new client gets the hub's
+in-memory snapshot.
+
+Cross-process signal: the hub polls one row (seasons.data_version) every
+LIVE_POLL_INTERVAL seconds, so results committed by any worker or the
+recompute-worker process are picked up. With LIVE_NOTIFY=postgres it also
+LISTENs on a channel that writers NOTIFY inside their transaction, so
+updates arrive immediately (needs a direct connection, not a
+transaction-mode pooler).
+"""
+
+import json
+import os
+import queue
+import select
+import threading
+
+from flask import current_app
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models import Match, Standing
+from app.services.cache_service import CacheService
+
+
+CHANNEL = "league_live"
+
+# Standing fields pushed to clients (team_id is the row key)
+LIVE_FIELDS = (
+    "position",
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "points",
+    "form",
+)
+
+
+class LiveService:
+    """Service for publishing live updates after writes."""
+
+    @staticmethod
+    def notify(season_id: int) -> None:
+        """
+        Signal hubs in every process that a season changed. Call inside the
+        writer's transaction: PostgreSQL delivers NOTIFY on commit. Other
+        databases rely on the hubs' version polling.
+        """
+        if current_app.config.get("LIVE_NOTIFY") == "postgres" and db.engine.dialect.name == "postgresql":
+            db.session.execute(
+                db.text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": CHANNEL, "payload": str(season_id)},
+            )
+
+    @staticmethod
+    def wake() -> None:
+        """Wake this process's hub after a commit (no-op if nobody is listening)."""
+        hub = current_app.extensions.get("live_hub")
+        if hub is not None:
+            hub.wake()
+
+
+class Subscriber:
+    """One SSE connection: a bounded queue of pre-formatted events."""
+
+    def __init__(self, max_events: int):
+        self.events = queue.Queue(maxsize=max_events)
+        self.closed = False
+
+
+class LiveHub:
+    """Per-process fan-out of live events to SSE subscribers."""
+
+    def __init__(self, app):
+        self.app = app
+        self.max_clients = app.config.get("LIVE_MAX_CONNECTIONS", 48)
+        self.queue_size = app.config.get("LIVE_QUEUE_SIZE", 100)
+        self.poll_interval = app.config.get("LIVE_POLL_INTERVAL", 2.0)
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._wake_pipe = None  # (read fd, write fd) when select()ing on LISTEN
+        self._listener = None  # Pooled LISTEN connection, held for the hub's lifetime
+        self._thread = None
+        self._pid = None
+        # Last published state: season token, {team_id: row}, last played_at
+        self._token = None
+        self._season = None
+        self._table = {}
+        self._last_played_at = None
+
+    def subscribe(self) -> Subscriber | None:
+        """Register a client; None when this worker is at LIVE_MAX_CONNECTIONS."""
+        self._ensure_thread()
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            subscriber = Subscriber(self.queue_size)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def snapshot(self) -> str:
+        """Full-table event for a new client, from memory once the hub has run."""
+        with self._lock:
+            if self._token is None:
+                self._refresh()
+            return format_event("snapshot", {
+                "season": self._season,
+                "standings": sorted(self._table.values(), key=lambda r: r["position"]),
+            })
+
+    def wake(self) -> None:
+        self._wake.set()
+        if self._wake_pipe is not None:
+            try:
+                os.write(self._wake_pipe[1], b"\0")
+            except BlockingIOError:
+                pass  # Unread wake-ups already pending
+
+    def publish(self, event: str) -> None:
+        """Queue an event for every client; clients that fall behind are dropped."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.events.put_nowait(event)
+            except queue.Full:
+                subscriber.closed = True
+                self.unsubscribe(subscriber)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._subscribers)
+
+    def _ensure_thread(self) -> None:
+        """Start the watcher lazily, once per process (safe with preload/fork)."""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="live-hub", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        self._listener = self._listen()
+        if self._listener is not None:
+            listener = self._listener.driver_connection
+            self._wake_pipe = os.pipe()
+            for fd in self._wake_pipe:
+                os.set_blocking(fd, False)
+        while True:
+            if self._listener is not None:
+                # Block on NOTIFY or a local wake, up to one poll interval
+                timeout = 0 if self._wake.is_set() else self.poll_interval
+                ready, _, _ = select.select([listener, self._wake_pipe[0]], [], [], timeout)
+                if listener in ready:
+                    listener.poll()
+                    listener.notifies.clear()
+                if self._wake_pipe[0] in ready:
+                    try:
+                        os.read(self._wake_pipe[0], 4096)
+                    except BlockingIOError:
+                        pass
+            else:
+                self._wake.wait(timeout=self.poll_interval)
+            self._wake.clear()
+            if not self._subscribers:
+                continue
+            with self.app.app_context():
+                try:
+                    with self._lock:
+                        events = self._refresh()
+                    for event in events:
+                        self.publish(event)
+                except Exception:
+                    self.app.logger.exception("live hub refresh failed")
+                finally:
+                    db.session.remove()
+
+    def _listen(self):
+        """
+        Dedicated LISTEN connection when LIVE_NOTIFY=postgres, else None.
+        Returns the pool's connection wrapper: the caller keeps it referenced,
+        or garbage collection would check the listening connection back in.
+        """
+        if self.app.config.get("LIVE_NOTIFY") != "postgres":
+            return None
+        with self.app.app_context():
+            if db.engine.dialect.name != "postgresql":
+                return None
+            try:
+                connection = db.engine.raw_connection()
+                connection.driver_connection.autocommit = True
+                connection.driver_connection.cursor().execute(f"LISTEN {CHANNEL}")
+                return connection
+            except Exception:
+                self.app.logger.exception("live hub LISTEN failed, falling back to polling")
+                return None
+
+    def _refresh(self) -> list:
+        """
+        Reload state if the current season's version moved (caller holds the
+        lock). Returns the delta events to publish.
+        """
+        token, _ = CacheService.version()
+        if token == self._token:
+            return []
+        season_id = int(token.split(":")[0]) if token != "none" else None
+        season_changed = season_id != self._season
+
+        table = {}
+        if season_id is not None:
+            for s in Standing.query.options(joinedload(Standing.team)).filter_by(season_id=season_id):
+                table[s.team_id] = {
+                    "team_id": s.team_id,
+                    "team_name": s.team.name,
+                    **{field: getattr(s, field) for field in LIVE_FIELDS},
+                    "goal_difference": s.goal_difference,
+                }
+
+        events = []
+        if season_changed or self._token is None:
+            events.append(format_event("snapshot", {
+                "season": season_id,
+                "standings": sorted(table.values(), key=lambda r: r["position"]),
+            }))
+        else:
+            changed = []
+            for team_id, row in table.items():
+                old = self._table.get(team_id, {})
+                diff = {k: v for k, v in row.items() if old.get(k) != v}
+                if diff:
+                    changed.append({"team_id": team_id, **diff})
+            if changed:
+                events.append(format_event("standings", {"season": season_id, "changed": changed}))
+
+        if season_id is not None:
+            q = Match.query.filter(
+                Match.season_id == season_id,
+                Match.is_played.is_(True),
+                Match.played_at.isnot(None),
+            )
+            if self._last_played_at is not None and not season_changed:
+                q = q.filter(Match.played_at > self._last_played_at)
+                for m in q.order_by(Match.played_at):
+                    events.append(format_event("score", {
+                        "match_id": m.id,
+                        "matchday": m.matchday,
+                        "home_team_id": m.home_team_id,
+                        "away_team_id": m.away_team_id,
+                        "home_goals": m.home_goals,
+                        "away_goals": m.away_goals,
+                    }))
+            self._last_played_at = (
+                db.session.query(db.func.max(Match.played_at))
+                .filter(Match.season_id == season_id)
+                .scalar()
+            )
+
+        self._token = token
+        self._season = season_id
+        self._table = table
+        return events
+
+
+def format_event(event: str, data: dict) -> str:
+    """SSE wire format for one event."""
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+def get_hub(app) -> LiveHub:
+    """One hub per app instance, stored on app.extensions."""
+    hub = app.extensions.get("live_hub")
+    if hub is None:
+        hub = app.extensions.setdefault("live_hub", LiveHub(app))
+    return hub
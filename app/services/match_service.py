@@ -3,10 +3,40 @@ Match service - records match results, updates stats, triggers standings.
 Transaction-safe. No duplicated stat logic - single source of truth.
 """
 
+from collections import Counter, defaultdict
 from datetime import datetime
+from sqlalchemy import case, update
 from app.extensions import db
-from app.models import Match, MatchEvent, Player, Standing
+from app.models import Match, MatchEvent, Player, PlayerSeasonStats, Standing
 from app.services.standings_service import StandingsService
+from app.services.snapshot_service import SnapshotService
+from app.services.recompute_service import RecomputeService
+from app.services.cache_service import CacheService
+from app.services.live_service import LiveService
+
+
+# Event columns that count a player as having appeared in the match
+PARTICIPANT_ATTRS = ("player_id", "goal_scorer_id", "assist_id", "player_off_id", "player_on_id")
+
+# Fields updated in place when a re-recorded event matches a stored one
+EVENT_UPDATE_ATTRS = (
+    "extra_time",
+    "goal_scorer_id",
+    "assist_id",
+    "is_penalty",
+    "is_own_goal",
+    "player_off_id",
+    "player_on_id",
+)
+
+# Columns written when new events are bulk inserted
+EVENT_INSERT_ATTRS = ("match_id", "event_type", "minute", "player_id") + EVENT_UPDATE_ATTRS
+
+# Denormalized Player counters maintained from match events
+PLAYER_STAT_COLUMNS = ("goals", "assists", "yellow_cards", "red_cards", "appearances", "clean_sheets")
+
+# PlayerSeasonStats counters (player counters plus the cards leaderboard key)
+SEASON_STAT_COLUMNS = PLAYER_STAT_COLUMNS + ("discipline_points",)
 
 
 class MatchService:
@@ -38,9 +68,9 @@ class MatchService:
         """
         match = Match.query.get_or_404(match_id)
 
-        # If already recorded, we need to revert stats first, then re-apply
+        # Already recorded: edit mode, only apply what changed
         if match.is_played:
-            cls._revert_match_stats(match)
+            return cls._rerecord_match_result(match, home_goals, away_goals, events or [])
 
         try:
             match.home_goals = home_goals
@@ -48,65 +78,189 @@ class MatchService:
             match.is_played = True
             match.played_at = datetime.utcnow()
 
-            # Clear existing events and add new ones
+            # Clear any stale events and add new ones
             MatchEvent.query.filter_by(match_id=match_id).delete()
 
-            if events:
-                for ev in events:
-                    event = cls._create_match_event(match, ev)
-                    if event:
-                        db.session.add(event)
+            new_events = cls._build_events(match, events or [])
+            cls._insert_events(new_events)
 
             db.session.flush()
 
-            # Update team stats via standings (single source of truth)
-            StandingsService.update_standings(match.season_id)
+            cls._update_team_stats(match, None)
 
             # Update player stats from events
-            cls._update_player_stats_from_events(match)
+            cls._update_player_stats_from_events(match, new_events)
 
+            CacheService.bump(match.season_id)
+            LiveService.notify(match.season_id)
             db.session.commit()
-            return match
-
         except Exception:
             db.session.rollback()
             raise
 
+        RecomputeService.notify()
+        LiveService.wake()
+        return match
+
     @classmethod
-    def _revert_match_stats(cls, match: Match) -> None:
-        """Revert player stats for a previously recorded match."""
-        for event in match.events.all():
-            player = Player.query.get(event.player_id)
-            if not player:
-                continue
+    def _rerecord_match_result(
+        cls,
+        match: Match,
+        home_goals: int,
+        away_goals: int,
+        events: list,
+    ) -> Match:
+        """
+        Correct an already recorded result. Submitted events are matched to
+        stored ones by (type, minute, player); only differing rows are
+        inserted, updated or deleted, only the net player stat deltas are
+        applied, and standings are skipped when the score is unchanged.
+        """
+        try:
+            previous = (match.home_goals, match.away_goals)
+            stored = match.events.all()
+            old_deltas, old_teams = cls._player_stat_deltas(match, stored)
 
-            if event.event_type == MatchEvent.TYPE_GOAL:
-                if event.goal_scorer_id:
-                    scorer = Player.query.get(event.goal_scorer_id)
-                    if scorer:
-                        scorer.goals = max(0, scorer.goals - 1)
-                if event.assist_id:
-                    assister = Player.query.get(event.assist_id)
-                    if assister:
-                        assister.assists = max(0, assister.assists - 1)
-            elif event.event_type == MatchEvent.TYPE_YELLOW:
-                player.yellow_cards = max(0, player.yellow_cards - 1)
-            elif event.event_type == MatchEvent.TYPE_RED:
-                player.red_cards = max(0, player.red_cards - 1)
+            match.home_goals = home_goals
+            match.away_goals = away_goals
+            match.played_at = datetime.utcnow()
+
+            current = cls._sync_events(stored, cls._build_events(match, events))
+            db.session.flush()
 
-        # Revert appearances for players who participated
-        home_ids = {e.player_id for e in match.events.all()}
-        home_ids.update({e.goal_scorer_id for e in match.events.all() if e.goal_scorer_id})
-        home_ids.update({e.assist_id for e in match.events.all() if e.assist_id})
-        home_ids.update({e.player_off_id for e in match.events.all() if e.player_off_id})
-        home_ids.update({e.player_on_id for e in match.events.all() if e.player_on_id})
+            new_deltas, new_teams = cls._player_stat_deltas(match, current)
+            net = cls._net_deltas(new_deltas, old_deltas)
+            cls._apply_player_deltas(net)
+            cls._apply_season_deltas(match.season_id, net, {**old_teams, **new_teams})
 
-        for pid in home_ids:
-            p = Player.query.get(pid)
-            if p:
-                p.appearances = max(0, p.appearances - 1)
+            if (home_goals, away_goals) != previous:
+                cls._update_team_stats(match, previous)
 
-        # Clean sheets reverted via standings recalc - we'll recalc anyway
+            CacheService.bump(match.season_id)
+            LiveService.notify(match.season_id)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        RecomputeService.notify()
+        LiveService.wake()
+        return match
+
+    @staticmethod
+    def _update_team_stats(match: Match, previous: tuple | None) -> None:
+        """
+        Update team stats via standings: queue a background recompute,
+        or apply only this match's delta in the request.
+        """
+        if RecomputeService.is_deferred():
+            RecomputeService.mark_dirty(match.season_id, match.matchday)
+        else:
+            StandingsService.apply_match_result(match, previous)
+            SnapshotService.refresh_after_result(match.season_id, match.matchday)
+
+    @classmethod
+    def _build_events(cls, match: Match, events: list) -> list:
+        """Transient MatchEvent objects for the submitted event dicts (invalid ones skipped)."""
+        built = []
+        for ev in events:
+            event = cls._create_match_event(match, ev)
+            if event:
+                built.append(event)
+        return built
+
+    @staticmethod
+    def _insert_events(events: list) -> None:
+        """
+        Insert new events with one executemany. The ORM would issue an INSERT
+        per row whenever consecutive events set different columns (goal, card,
+        substitution); nothing reads the new ids, so the objects stay transient.
+        """
+        if events:
+            db.session.execute(
+                MatchEvent.__table__.insert(),
+                [{attr: getattr(event, attr) for attr in EVENT_INSERT_ATTRS} for event in events],
+            )
+
+    @classmethod
+    def _sync_events(cls, stored: list, submitted: list) -> list:
+        """
+        Reconcile stored events with submitted ones keyed by (type, minute, player).
+        Matching rows are updated in place only where a field differs; the rest
+        are inserted or deleted. Returns the match's resulting events.
+        """
+        pool = defaultdict(list)
+        for event in stored:
+            pool[(event.event_type, event.minute, event.player_id)].append(event)
+
+        result = []
+        added = []
+        for event in submitted:
+            bucket = pool.get((event.event_type, event.minute, event.player_id))
+            if bucket:
+                existing = bucket.pop(0)
+                for attr in EVENT_UPDATE_ATTRS:
+                    value = getattr(event, attr)
+                    if getattr(existing, attr) != value:
+                        setattr(existing, attr, value)
+                result.append(existing)
+            else:
+                added.append(event)
+                result.append(event)
+
+        for bucket in pool.values():
+            for event in bucket:
+                db.session.delete(event)
+        cls._insert_events(added)
+        return result
+
+    @staticmethod
+    def _net_deltas(new: dict, old: dict) -> dict:
+        """new - old per player and stat, dropping players with no net change."""
+        net = defaultdict(Counter)
+        for pid, d in new.items():
+            net[pid].update(d)
+        for pid, d in old.items():
+            net[pid].subtract(d)
+        return {pid: d for pid, d in net.items() if any(d.values())}
+
+    @classmethod
+    def rebuild_player_season_stats(cls, season_id: int) -> int:
+        """
+        Rebuild PlayerSeasonStats for a season from its played matches' events
+        (backfill). Rows use the side each player played for. Commits.
+
+        Returns:
+            Number of rows written
+        """
+        totals = defaultdict(Counter)
+        matches = Match.query.filter_by(season_id=season_id, is_played=True).all()
+        events_by_match = defaultdict(list)
+        if matches:
+            for event in MatchEvent.query.filter(MatchEvent.match_id.in_([m.id for m in matches])):
+                events_by_match[event.match_id].append(event)
+
+        for match in matches:
+            deltas, teams = cls._player_stat_deltas(match, events_by_match[match.id])
+            for pid, d in deltas.items():
+                totals[(pid, teams[pid])].update(d)
+
+        PlayerSeasonStats.query.filter_by(season_id=season_id).delete()
+        rows = [
+            {
+                "player_id": pid,
+                "season_id": season_id,
+                "team_id": team_id,
+                **{column: d[column] for column in PLAYER_STAT_COLUMNS},
+                "discipline_points": d["yellow_cards"] + 2 * d["red_cards"],
+            }
+            for (pid, team_id), d in totals.items()
+        ]
+        if rows:
+            db.session.execute(PlayerSeasonStats.__table__.insert(), rows)
+        CacheService.bump(season_id)
+        db.session.commit()
+        return len(rows)
 
     @classmethod
     def _create_match_event(cls, match: Match, data: dict) -> MatchEvent | None:
@@ -121,6 +275,8 @@ class MatchService:
             minute=data.get("minute", 0),
             extra_time=data.get("extra_time"),
             player_id=data.get("player_id"),
+            is_penalty=False,
+            is_own_goal=False,
         )
 
         if event_type == MatchEvent.TYPE_GOAL:
@@ -141,18 +297,34 @@ class MatchService:
         return ev
 
     @classmethod
-    def _update_player_stats_from_events(cls, match: Match) -> None:
+    def _update_player_stats_from_events(cls, match: Match, events: list | None = None) -> None:
         """Update player goals, assists, cards, appearances, clean sheets from events."""
-        home_team_id = match.home_team_id
-        away_team_id = match.away_team_id
-        home_goals = match.home_goals or 0
-        away_goals = match.away_goals or 0
+        if events is None:
+            events = match.events.all()
+        cls._apply_match_stats(match, events)
+
+    @classmethod
+    def _apply_match_stats(cls, match: Match, events: list, sign: int = 1) -> None:
+        """Apply (or revert) one match's deltas to lifetime and per-season player stats."""
+        deltas, teams = cls._player_stat_deltas(match, events)
+        cls._apply_player_deltas(deltas, sign)
+        cls._apply_season_deltas(match.season_id, deltas, teams, sign)
 
+    @classmethod
+    def _player_stat_deltas(cls, match: Match, events: list) -> tuple:
+        """
+        Per-player counter deltas for one match, built in memory.
+        Applying these and applying them with sign=-1 are exact inverses.
+
+        Returns:
+            ({player_id: Counter(stat column -> delta)}, {player_id: team_id})
+        """
+        deltas = defaultdict(Counter)
         participants = set()
 
-        for event in match.events:
+        for event in events:
             # Appearances: any player in an event
-            for attr in ("player_id", "goal_scorer_id", "assist_id", "player_off_id", "player_on_id"):
+            for attr in PARTICIPANT_ATTRS:
                 pid = getattr(event, attr, None)
                 if pid:
                     participants.add(pid)
@@ -160,55 +332,145 @@ class MatchService:
             if event.event_type == MatchEvent.TYPE_GOAL:
                 scorer_id = event.goal_scorer_id or event.player_id
                 if scorer_id and not event.is_own_goal:
-                    scorer = Player.query.get(scorer_id)
-                    if scorer:
-                        scorer.goals = (scorer.goals or 0) + 1
+                    deltas[scorer_id]["goals"] += 1
                 if event.assist_id:
-                    assister = Player.query.get(event.assist_id)
-                    if assister:
-                        assister.assists = (assister.assists or 0) + 1
+                    deltas[event.assist_id]["assists"] += 1
             elif event.event_type == MatchEvent.TYPE_YELLOW:
-                p = Player.query.get(event.player_id)
-                if p:
-                    p.yellow_cards = (p.yellow_cards or 0) + 1
+                deltas[event.player_id]["yellow_cards"] += 1
             elif event.event_type == MatchEvent.TYPE_RED:
-                p = Player.query.get(event.player_id)
-                if p:
-                    p.red_cards = (p.red_cards or 0) + 1
+                deltas[event.player_id]["red_cards"] += 1
 
         for pid in participants:
-            p = Player.query.get(pid)
-            if p:
-                p.appearances = (p.appearances or 0) + 1
+            deltas[pid]["appearances"] += 1
 
         # Clean sheets: GK/DEF who played (in events) and team conceded 0
-        home_conceded = away_goals
-        away_conceded = home_goals
-
-        home_def_players = set()
-        away_def_players = set()
-        
-        # Get all players who participated in the match
-        for e in match.events:
-            # Check all possible player relationships for participation
-            for attr in ("player_id", "goal_scorer_id", "assist_id", "player_off_id", "player_on_id"):
-                pid = getattr(e, attr, None)
-                if pid:
-                    p = Player.query.get(pid)
-                    if p and p.is_goalkeeper_or_defender():
-                        if p.team_id == home_team_id:
-                            home_def_players.add(pid)
-                        elif p.team_id == away_team_id:
-                            away_def_players.add(pid)
-
-        # Award clean sheets
-        if home_conceded == 0:
-            for pid in home_def_players:
-                p = Player.query.get(pid)
-                if p:
-                    p.clean_sheets = (p.clean_sheets or 0) + 1
-        if away_conceded == 0:
-            for pid in away_def_players:
-                p = Player.query.get(pid)
-                if p:
-                    p.clean_sheets = (p.clean_sheets or 0) + 1
+        clean_teams = set()
+        if (match.away_goals or 0) == 0:
+            clean_teams.add(match.home_team_id)
+        if (match.home_goals or 0) == 0:
+            clean_teams.add(match.away_team_id)
+
+        # One query for every involved player: team (for season rows) and position
+        players = {}
+        ids = participants | set(deltas)
+        if ids:
+            players = {
+                pid: (team_id, position)
+                for pid, team_id, position in db.session.query(
+                    Player.id, Player.team_id, Player.position
+                ).filter(Player.id.in_(ids))
+            }
+
+        # Season rows are keyed by the side a player played for, so recording,
+        # correcting and reverting a match hit the same row after a transfer.
+        # Players no longer at either club keep the side their season stats
+        # were recorded under (one extra query, only when someone has moved).
+        sides = (match.home_team_id, match.away_team_id)
+        moved = [pid for pid, (team_id, _) in players.items() if team_id not in sides]
+        if moved:
+            recorded = dict(
+                db.session.query(PlayerSeasonStats.player_id, PlayerSeasonStats.team_id).filter(
+                    PlayerSeasonStats.season_id == match.season_id,
+                    PlayerSeasonStats.player_id.in_(moved),
+                    PlayerSeasonStats.team_id.in_(sides),
+                )
+            )
+            for pid in recorded:
+                players[pid] = (recorded[pid], players[pid][1])
+
+        for pid in participants:
+            team_id, position = players.get(pid, (None, None))
+            if team_id in clean_teams and position in (
+                Player.POSITION_GOALKEEPER,
+                Player.POSITION_DEFENDER,
+            ):
+                deltas[pid]["clean_sheets"] += 1
+
+        # Drop players that no longer exist
+        deltas = {pid: d for pid, d in deltas.items() if pid in players}
+        teams = {pid: team for pid, (team, _) in players.items()}
+        return deltas, teams
+
+    @staticmethod
+    def _apply_player_deltas(deltas: dict, sign: int = 1) -> None:
+        """
+        Apply per-player deltas in a single UPDATE ... WHERE id IN (...),
+        one CASE per stat column. Decrements are clamped at zero.
+        """
+        if not deltas:
+            return
+
+        values = {}
+        for column in PLAYER_STAT_COLUMNS:
+            by_player = {pid: sign * d[column] for pid, d in deltas.items() if d[column]}
+            if not by_player:
+                continue
+            attr = getattr(Player, column)
+            new_value = attr + case(by_player, value=Player.id, else_=0)
+            if min(by_player.values()) < 0:
+                new_value = case((new_value < 0, 0), else_=new_value)
+            values[column] = new_value
+
+        if values:
+            db.session.execute(
+                update(Player)
+                .where(Player.id.in_(list(deltas)))
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+
+    @staticmethod
+    def _apply_season_deltas(season_id: int, deltas: dict, teams: dict, sign: int = 1) -> None:
+        """
+        Upsert per-season rows keyed by (player, season, team) with the same
+        deltas, using the side each player played for (teams from
+        _player_stat_deltas).
+        """
+        rows = []
+        for pid, d in deltas.items():
+            row = {column: sign * d[column] for column in PLAYER_STAT_COLUMNS}
+            row["discipline_points"] = sign * (d["yellow_cards"] + 2 * d["red_cards"])
+            if any(row.values()):
+                rows.append({"player_id": pid, "season_id": season_id, "team_id": teams[pid], **row})
+        if not rows:
+            return
+
+        dialect = db.engine.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            for row in rows:
+                key = (row["player_id"], row["season_id"], row["team_id"])
+                stats = db.session.get(PlayerSeasonStats, key)
+                if stats is None:
+                    stats = PlayerSeasonStats(**{k: max(0, v) for k, v in row.items()})
+                    db.session.add(stats)
+                    continue
+                for column in SEASON_STAT_COLUMNS:
+                    setattr(stats, column, max(0, getattr(stats, column) + row[column]))
+            return
+
+        # New rows are clamped at zero like the fallback above, so a conflicting
+        # row cannot take a negative delta from excluded: those columns add the
+        # raw deltas by player instead (each player appears once per call)
+        t = PlayerSeasonStats.__table__
+        stmt = insert(t).values([
+            {k: max(0, v) if k in SEASON_STAT_COLUMNS else v for k, v in row.items()}
+            for row in rows
+        ])
+        set_ = {}
+        for column in SEASON_STAT_COLUMNS:
+            if min(row[column] for row in rows) >= 0:
+                set_[column] = t.c[column] + stmt.excluded[column]
+                continue
+            by_player = {row["player_id"]: row[column] for row in rows if row[column]}
+            new_value = t.c[column] + case(by_player, value=t.c.player_id, else_=0)
+            set_[column] = case((new_value < 0, 0), else_=new_value)
+        db.session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["player_id", "season_id", "team_id"],
+                set_=set_,
+            )
+        )
@@ -0,0 +1,154 @@
+"""
+Pagination service - keyset (cursor) pagination for lists.
+A page is fetched with WHERE (sort keys) > (last row's keys) instead of
+OFFSET, so deep pages cost the same as the first. Cursors are opaque
+base64 tokens; ?page=N still works (offset) for older clients. Totals
+are optional and cached for PAGINATION_COUNT_TTL seconds.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import DateTime, tuple_
+
+from app.extensions import db
+from app.services.cache_service import CacheService
+
+
+class KeysetPage:
+    """One page of results with cursors to its neighbours."""
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None, page=None, total=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+        self.page = page  # Only set for ?page=N (offset) requests
+        self.total = total  # None unless requested
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+    @property
+    def pages(self) -> int | None:
+        if self.total is None:
+            return None
+        return -(-self.total // self.per_page)  # 0 for an empty result, as before
+
+
+class PaginationService:
+    """Service for cursor pagination over a fixed, unique sort order."""
+
+    NEXT = "n"
+    PREV = "p"
+
+    @classmethod
+    def paginate(
+        cls,
+        query,
+        keys: tuple,
+        per_page: int,
+        cursor: str | None = None,
+        page: int | None = None,
+        descending: bool = False,
+        with_total: bool = False,
+    ) -> KeysetPage:
+        """
+        Fetch one page of an ORM query ordered by keys.
+
+        Args:
+            query: Filtered query without an ORDER BY
+            keys: Sort columns, ending with the primary key so the order is unique
+            per_page: Page size (at least 1)
+            cursor: Token from a previous page (takes precedence over page)
+            page: 1-based offset page for clients that do not send cursors
+            descending: Sort every key descending (newest first)
+            with_total: Also count matching rows (cached)
+
+        Returns:
+            KeysetPage
+
+        Raises:
+            ValueError: cursor is malformed or was issued for other keys
+        """
+        per_page = max(per_page, 1)
+        total = cls.count(query) if with_total else None
+        if cursor:
+            direction, values = cls._decode(cursor, keys)
+            backwards = direction == cls.PREV
+            reverse = descending != backwards
+            bound = tuple_(*keys) < tuple_(*values) if reverse else tuple_(*keys) > tuple_(*values)
+            rows = (
+                query.filter(bound)
+                .order_by(*(k.desc() if reverse else k.asc() for k in keys))
+                .limit(per_page + 1)
+                .all()
+            )
+            more = len(rows) > per_page
+            rows = rows[:per_page]
+            if backwards:
+                rows.reverse()
+            next_cursor = cls._cursor_for(rows[-1], keys, cls.NEXT) if rows and (more or backwards) else None
+            prev_cursor = cls._cursor_for(rows[0], keys, cls.PREV) if rows and (more or not backwards) else None
+            return KeysetPage(rows, per_page, next_cursor, prev_cursor, total=total)
+
+        page = max(page or 1, 1)
+        rows = (
+            query.order_by(*(k.desc() if descending else k.asc() for k in keys))
+            .offset((page - 1) * per_page)
+            .limit(per_page + 1)
+            .all()
+        )
+        more = len(rows) > per_page
+        rows = rows[:per_page]
+        next_cursor = cls._cursor_for(rows[-1], keys, cls.NEXT) if more else None
+        prev_cursor = cls._cursor_for(rows[0], keys, cls.PREV) if rows and page > 1 else None
+        return KeysetPage(rows, per_page, next_cursor, prev_cursor, page=page, total=total)
+
+    @staticmethod
+    def count(query) -> int:
+        """Row count for a query, cached per compiled SQL and parameters."""
+        query = query.order_by(None)
+        compiled = query.statement.compile(dialect=db.engine.dialect)
+        key = "count:" + hashlib.sha1(
+            repr((str(compiled), sorted(compiled.params.items()))).encode()
+        ).hexdigest()
+        backend = CacheService.backend()
+        total = backend.get(key)
+        if total is None:
+            total = query.count()
+            backend.set(key, total, current_app.config.get("PAGINATION_COUNT_TTL", 60))
+        return total
+
+    @staticmethod
+    def _cursor_for(item, keys: tuple, direction: str) -> str:
+        values = []
+        for key in keys:
+            value = getattr(item, key.key)
+            values.append(value.isoformat() if isinstance(value, datetime) else value)
+        raw = json.dumps([direction, *values], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def _decode(cls, cursor: str, keys: tuple) -> tuple:
+        """Returns (direction, key values)."""
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            direction, *values = json.loads(raw)
+            if direction not in (cls.NEXT, cls.PREV) or len(values) != len(keys):
+                raise ValueError
+            return direction, [
+                datetime.fromisoformat(v) if isinstance(k.type, DateTime) else v
+                for k, v in zip(keys, values)
+            ]
+        except (binascii.Error, TypeError, ValueError):
+            raise ValueError("invalid cursor") from None
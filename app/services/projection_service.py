@@ -0,0 +1,230 @@
+"""
+Projection service - Monte Carlo simulation of the remaining fixtures.
+Goals are drawn from a Poisson strength model (attack/defence per team,
+home advantage); final tables are ranked by points, GD, GF and team id like
+StandingsService._rank_teams (head-to-head is not replayed per simulation).
+Simulations are vectorized with NumPy and split across a long-lived
+process pool (forkserver/spawn workers - forking a threaded server worker
+could copy held locks). Optional: requires numpy.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from flask import current_app
+
+from app.extensions import db
+from app.models import Match
+from app.services.standings_service import StandingsService
+
+
+# Simulations per worker task; bounds memory to chunk x remaining matches
+CHUNK_SIZE = 10000
+
+
+class ProjectionService:
+    """Service for season projections (probability of each final position)."""
+
+    HOME_ADVANTAGE = 1.15
+    DEFAULT_GOALS_PER_GAME = 1.35
+    PRIOR_MATCHES = 5  # shrinks early-season strengths toward league average
+
+    # (season_id, results recorded) -> (last played_at, projection dict)
+    _cache = {}
+    CACHE_SIZE = 32
+    _cache_lock = threading.Lock()  # One simulation run at a time per process
+
+    # Worker pool shared by every request in this process, started on first use
+    _pool = None
+    _pool_lock = threading.Lock()
+
+    @classmethod
+    def project_season(cls, season_id: int) -> dict:
+        """
+        Probability of each final position for every team in a season, from
+        PROJECTION_SIMULATIONS simulated seasons. Cached per (season, results
+        recorded); an entry is also replaced when the latest played_at moves,
+        so re-recording a score invalidates it.
+
+        Args:
+            season_id: Season to project
+
+        Returns:
+            Dict with results_recorded, remaining_matches and per-team probabilities
+        """
+        results_recorded, last_played_at = (
+            db.session.query(db.func.count(Match.id), db.func.max(Match.played_at))
+            .filter(
+                Match.season_id == season_id,
+                Match.is_played.is_(True),
+                Match.home_goals.isnot(None),
+                Match.away_goals.isnot(None),
+            )
+            .one()
+        )
+        key = (season_id, results_recorded)
+        cached = cls._cache.get(key)
+        if cached is not None and cached[0] == last_played_at:
+            return cached[1]
+
+        # Concurrent requests for the same results wait for one run
+        with cls._cache_lock:
+            cached = cls._cache.get(key)
+            if cached is not None and cached[0] == last_played_at:
+                return cached[1]
+            projection = cls._run_projection(season_id, current_app.config["PROJECTION_SIMULATIONS"])
+            projection["results_recorded"] = results_recorded
+            cls._cache.pop(key, None)
+            if len(cls._cache) >= cls.CACHE_SIZE:
+                cls._cache.pop(next(iter(cls._cache)))
+            cls._cache[key] = (last_played_at, projection)
+        return projection
+
+    @classmethod
+    def _run_projection(cls, season_id: int, simulations: int) -> dict:
+        """Build the strength model and simulate the remaining fixtures."""
+        table = StandingsService.compute_standings(season_id)
+        team_ids = sorted(tid for tid, _ in table)
+        n = len(team_ids)
+        if n == 0:
+            return {"simulations": simulations, "remaining_matches": 0, "teams": []}
+
+        index = {tid: i for i, tid in enumerate(team_ids)}
+        stats = dict(table)
+        played = np.array([stats[tid]["played"] for tid in team_ids], dtype=np.float64)
+        goals_for = np.array([stats[tid]["goals_for"] for tid in team_ids], dtype=np.float64)
+        goals_against = np.array([stats[tid]["goals_against"] for tid in team_ids], dtype=np.float64)
+        base = np.array(
+            [
+                (stats[tid]["points"], stats[tid]["goal_difference"], stats[tid]["goals_for"])
+                for tid in team_ids
+            ],
+            dtype=np.int64,
+        )
+
+        remaining = [
+            (index[home], index[away])
+            for home, away in db.session.query(Match.home_team_id, Match.away_team_id)
+            .filter(Match.season_id == season_id, Match.is_played.is_(False))
+            .all()
+            if home in index and away in index
+        ]
+        home_idx = np.array([h for h, _ in remaining], dtype=np.int64)
+        away_idx = np.array([a for _, a in remaining], dtype=np.int64)
+
+        # Poisson strength model with a prior of PRIOR_MATCHES average games
+        mu = goals_for.sum() / played.sum() if played.sum() else cls.DEFAULT_GOALS_PER_GAME
+        attack = (goals_for + cls.PRIOR_MATCHES * mu) / ((played + cls.PRIOR_MATCHES) * mu)
+        defence = (goals_against + cls.PRIOR_MATCHES * mu) / ((played + cls.PRIOR_MATCHES) * mu)
+        lam_home = mu * attack[home_idx] * defence[away_idx] * cls.HOME_ADVANTAGE
+        lam_away = mu * attack[away_idx] * defence[home_idx] / cls.HOME_ADVANTAGE
+
+        counts = cls._simulate(simulations, home_idx, away_idx, lam_home, lam_away, base, n)
+        probabilities = counts / simulations
+
+        relegation_spots = current_app.config.get("RELEGATION_SPOTS", 3)
+        teams = []
+        for tid, s in table:
+            p = probabilities[index[tid]]
+            teams.append({
+                "team_id": tid,
+                "points": s["points"],
+                "position_probabilities": [round(float(x), 4) for x in p],
+                "expected_position": round(float((p * np.arange(1, n + 1)).sum()), 2),
+                "title": round(float(p[0]), 4),
+                "relegation": round(float(p[max(0, n - relegation_spots):].sum()), 4) if relegation_spots else 0.0,
+            })
+
+        return {
+            "simulations": simulations,
+            "remaining_matches": len(remaining),
+            "teams": teams,
+        }
+
+    @classmethod
+    def _simulate(cls, simulations, home_idx, away_idx, lam_home, lam_away, base, n) -> np.ndarray:
+        """Run simulations (in parallel when more than one chunk). Returns (n, n) position counts."""
+        sizes = [CHUNK_SIZE] * (simulations // CHUNK_SIZE)
+        if simulations % CHUNK_SIZE:
+            sizes.append(simulations % CHUNK_SIZE)
+        seeds = np.random.SeedSequence().spawn(len(sizes))
+        tasks = [
+            (seed, size, home_idx, away_idx, lam_home, lam_away, base, n)
+            for seed, size in zip(seeds, sizes)
+        ]
+
+        workers = current_app.config.get("PROJECTION_WORKERS")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if len(tasks) == 1 or workers < 2:
+            return sum(map(_simulate_chunk, tasks))
+
+        pool = cls._get_pool(workers)
+        try:
+            return sum(pool.map(_simulate_chunk, tasks))
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool next time and finish this one here
+            current_app.logger.warning("projection pool broken, simulating in-process")
+            with cls._pool_lock:
+                if cls._pool is pool:
+                    cls._pool = None
+            return sum(map(_simulate_chunk, tasks))
+
+    @classmethod
+    def _get_pool(cls, workers: int) -> ProcessPoolExecutor:
+        """The process pool, created on first use with forkserver (or spawn) workers."""
+        with cls._pool_lock:
+            if cls._pool is None:
+                methods = multiprocessing.get_all_start_methods()
+                context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+                cls._pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            return cls._pool
+
+
+def _simulate_chunk(task: tuple) -> np.ndarray:
+    """
+    Simulate one chunk of seasons (module-level so it can run in a worker process).
+    Returns (n, n) counts: counts[team, position - 1].
+    """
+    seed, size, home_idx, away_idx, lam_home, lam_away, base, n = task
+    rng = np.random.default_rng(seed)
+    points = np.broadcast_to(base[:, 0], (size, n)).copy()
+    goal_diff = np.broadcast_to(base[:, 1], (size, n)).copy()
+    goals_for = np.broadcast_to(base[:, 2], (size, n)).copy()
+
+    if len(home_idx):
+        hg = rng.poisson(lam_home, size=(size, len(home_idx)))
+        ag = rng.poisson(lam_away, size=(size, len(away_idx)))
+        win, draw, loss = (
+            StandingsService.POINTS_WIN,
+            StandingsService.POINTS_DRAW,
+            StandingsService.POINTS_LOSS,
+        )
+        home_pts = np.where(hg > ag, win, np.where(hg == ag, draw, loss))
+        away_pts = np.where(ag > hg, win, np.where(hg == ag, draw, loss))
+
+        # One-hot fixture -> team incidence, so per-team sums are matrix products
+        home_onehot = np.zeros((len(home_idx), n), dtype=np.int64)
+        home_onehot[np.arange(len(home_idx)), home_idx] = 1
+        away_onehot = np.zeros((len(away_idx), n), dtype=np.int64)
+        away_onehot[np.arange(len(away_idx)), away_idx] = 1
+
+        points += home_pts @ home_onehot + away_pts @ away_onehot
+        goal_diff += (hg - ag) @ home_onehot + (ag - hg) @ away_onehot
+        goals_for += hg @ home_onehot + ag @ away_onehot
+
+    # Rank by points, GD, GF desc; stable sort keeps lower team id first on full ties
+    span = int(goals_for.max()) + 1
+    gd_offset = int(-goal_diff.min())
+    gd_span = int(goal_diff.max()) + gd_offset + 1
+    score = (points * gd_span + goal_diff + gd_offset) * span + goals_for
+    order = np.argsort(-score, axis=1, kind="stable")
+    positions = np.empty_like(order)
+    np.put_along_axis(positions, order, np.arange(n)[None, :], axis=1)
+
+    flat = (np.arange(n)[None, :] * n + positions).ravel()
+    return np.bincount(flat, minlength=n * n).reshape(n, n)
@@ -0,0 +1,249 @@
+"""
+Recompute service - background standings/snapshot recomputes with coalescing.
+
+MatchService marks a season dirty in the same transaction as the result;
+a worker later claims the season and runs one full recompute however many
+results arrived in between. Workers run in-process (a daemon thread woken
+after each commit) or as a separate process (flask recompute-worker).
+Season.standings_dirty / standings_version tell readers a table is updating.
+Failed recomputes back off exponentially and stop after RECOMPUTE_MAX_ATTEMPTS
+(Season.recompute_failures), so one broken season cannot spin a worker.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import case, update
+
+from app.extensions import db
+from app.models import Season
+from app.services.standings_service import StandingsService
+from app.services.snapshot_service import SnapshotService
+from app.services.live_service import LiveService
+
+
+class RecomputeService:
+    """Service for deferring and running season-level derived-data recomputes."""
+
+    MODE_SYNC = "sync"  # Recompute inside the request (no queue)
+    MODE_THREAD = "thread"  # In-process background thread
+    MODE_WORKER = "worker"  # Separate `flask recompute-worker` process
+
+    @staticmethod
+    def mode() -> str:
+        """Configured recompute mode (STANDINGS_RECOMPUTE)."""
+        return current_app.config.get("STANDINGS_RECOMPUTE", RecomputeService.MODE_SYNC)
+
+    @classmethod
+    def is_deferred(cls) -> bool:
+        """Whether recomputes are queued instead of run in the request."""
+        return cls.mode() != cls.MODE_SYNC
+
+    @staticmethod
+    def mark_dirty(season_id: int, matchday: int, **values) -> None:
+        """
+        Queue a recompute for a season (no commit - part of the caller's transaction).
+        Repeated marks coalesce; snapshots restart from the earliest matchday.
+        A new mark also clears earlier failures (values override, for retries).
+        """
+        db.session.execute(
+            update(Season)
+            .where(Season.id == season_id)
+            .values(
+                standings_dirty=True,
+                snapshots_dirty_from=case(
+                    (Season.snapshots_dirty_from.is_(None), matchday),
+                    (Season.snapshots_dirty_from > matchday, matchday),
+                    else_=Season.snapshots_dirty_from,
+                ),
+                **{"recompute_failures": 0, "recompute_retry_at": None, **values},
+            )
+        )
+
+    @staticmethod
+    def max_attempts() -> int:
+        return current_app.config.get("RECOMPUTE_MAX_ATTEMPTS", 5)
+
+    @staticmethod
+    def reset_failures() -> int:
+        """Make seasons that gave up eligible again (commits). Returns seasons reset."""
+        result = db.session.execute(
+            update(Season)
+            .where(Season.recompute_failures > 0)
+            .values(recompute_failures=0, recompute_retry_at=None)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    @classmethod
+    def notify(cls) -> None:
+        """Wake the in-process worker after a commit (no-op in other modes)."""
+        if cls.mode() == cls.MODE_THREAD:
+            _get_worker(current_app._get_current_object()).wake()
+
+    @classmethod
+    def process_pending(cls) -> list:
+        """
+        Claim and recompute every dirty season once (skipping seasons that
+        are backing off after a failure or have given up).
+
+        Returns:
+            List of season ids recomputed by this call
+        """
+        processed = []
+        pending = [
+            sid
+            for (sid,) in db.session.query(Season.id)
+            .filter(
+                Season.standings_dirty.is_(True),
+                Season.recompute_failures < cls.max_attempts(),
+                db.or_(
+                    Season.recompute_retry_at.is_(None),
+                    Season.recompute_retry_at <= datetime.utcnow(),
+                ),
+            )
+            .all()
+        ]
+        for season_id in pending:
+            claimed, from_matchday = cls._claim(season_id)
+            if not claimed:
+                continue  # Another worker got it first
+            try:
+                StandingsService.recompute_standings(season_id)
+                SnapshotService.refresh_from(season_id, from_matchday or 0)
+                db.session.execute(
+                    update(Season)
+                    .where(Season.id == season_id)
+                    .values(
+                        standings_version=Season.standings_version + 1,
+                        data_version=Season.data_version + 1,
+                    )
+                )
+                LiveService.notify(season_id)
+                db.session.commit()
+                LiveService.wake()
+                processed.append(season_id)
+            except Exception:
+                db.session.rollback()
+                cls._record_failure(season_id, from_matchday or 0)
+        return processed
+
+    @classmethod
+    def _record_failure(cls, season_id: int, from_matchday: int) -> None:
+        """Re-queue a failed season with exponential backoff, or give up (commits)."""
+        failures = (
+            db.session.query(Season.recompute_failures).filter(Season.id == season_id).scalar() or 0
+        ) + 1
+        config = current_app.config
+        delay = min(
+            config.get("RECOMPUTE_BACKOFF", 30) * 2 ** (failures - 1),
+            config.get("RECOMPUTE_BACKOFF_MAX", 3600),
+        )
+        cls.mark_dirty(
+            season_id,
+            from_matchday,
+            recompute_failures=failures,
+            recompute_retry_at=datetime.utcnow() + timedelta(seconds=delay),
+        )
+        db.session.commit()
+        if failures >= cls.max_attempts():
+            current_app.logger.exception(
+                "standings recompute failed season=%s attempt=%s, giving up until the next "
+                "result or `flask recompute-worker --reset-failed`",
+                season_id,
+                failures,
+            )
+        else:
+            current_app.logger.exception(
+                "standings recompute failed season=%s attempt=%s, retrying in %ss",
+                season_id,
+                failures,
+                delay,
+            )
+
+    @staticmethod
+    def _claim(season_id: int) -> tuple:
+        """
+        Atomically clear a season's dirty flag (compare-and-swap on
+        snapshots_dirty_from so a concurrent mark is never lost).
+
+        Returns:
+            (claimed, snapshots_dirty_from)
+        """
+        while True:
+            row = (
+                db.session.query(Season.standings_dirty, Season.snapshots_dirty_from)
+                .filter(Season.id == season_id)
+                .one_or_none()
+            )
+            if row is None or not row.standings_dirty:
+                db.session.rollback()
+                return False, None
+            from_matchday = row.snapshots_dirty_from
+            result = db.session.execute(
+                update(Season)
+                .where(
+                    Season.id == season_id,
+                    Season.standings_dirty.is_(True),
+                    Season.snapshots_dirty_from.is_not_distinct_from(from_matchday),
+                )
+                .values(standings_dirty=False, snapshots_dirty_from=None)
+            )
+            db.session.commit()
+            if result.rowcount:
+                return True, from_matchday
+
+    @classmethod
+    def run_worker(cls, poll_interval: float = 2.0, once: bool = False) -> None:
+        """Poll for dirty seasons forever (CLI worker mode)."""
+        while True:
+            cls.process_pending()
+            if once:
+                return
+            time.sleep(poll_interval)
+
+
+class RecomputeWorker:
+    """In-process daemon thread that drains dirty seasons when woken."""
+
+    POLL_INTERVAL = 30  # Safety net: also pick up seasons marked by other processes
+
+    def __init__(self, app):
+        self.app = app
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def wake(self) -> None:
+        """Start the thread if needed and signal pending work."""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="standings-recompute",
+                    daemon=True,
+                )
+                self._thread.start()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=self.POLL_INTERVAL)
+            self._wake.clear()
+            with self.app.app_context():
+                try:
+                    RecomputeService.process_pending()
+                except Exception:
+                    self.app.logger.exception("standings recompute worker error")
+                finally:
+                    db.session.remove()
+
+
+def _get_worker(app) -> RecomputeWorker:
+    """One worker per app instance, stored on app.extensions."""
+    worker = app.extensions.get("recompute_worker")
+    if worker is None:
+        worker = app.extensions.setdefault("recompute_worker", RecomputeWorker(app))
+    return worker
@@ -0,0 +1,204 @@
+"""
+Snapshot service - per-matchday league table snapshots.
+Stores the table after each matchday so "table as of round N" and position
+history are index lookups instead of replaying the season.
+"""
+
+from sqlalchemy.orm import joinedload
+
+from app.extensions import db
+from app.models import Season, Match, Standing, StandingSnapshot
+from app.services.standings_service import StandingsService
+from app.services.cache_service import CacheService
+
+
+# Snapshot columns copied from a computed table row
+SNAPSHOT_FIELDS = (
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "points",
+)
+
+
+class SnapshotService:
+    """Service for building and reading per-matchday standings snapshots."""
+
+    @classmethod
+    def refresh_from(cls, season_id: int, matchday: int) -> int:
+        """
+        Rebuild snapshots for a matchday and every later one (a late result
+        changes all tables after it). Usually only the latest matchday. Does not commit.
+
+        Args:
+            season_id: Season of the recorded match
+            matchday: Matchday of the recorded match
+
+        Returns:
+            Number of snapshot rows written
+        """
+        season = Season.query.get_or_404(season_id)
+        team_ids = [t.id for t in season.teams]
+
+        StandingSnapshot.query.filter(
+            StandingSnapshot.season_id == season_id,
+            StandingSnapshot.matchday >= matchday,
+        ).delete(synchronize_session=False)
+        if not team_ids:
+            return 0
+
+        matches = cls._load_played_matches(season_id)
+        matchdays = sorted({m[0] for m in matches if m[0] >= matchday})
+
+        rows = []
+        for md in matchdays:
+            played = [m[1:] for m in matches if m[0] <= md]
+            table = StandingsService.rank_table(played, team_ids)
+            rows.extend(
+                {
+                    "season_id": season_id,
+                    "matchday": md,
+                    "team_id": team_id,
+                    "position": pos,
+                    **{field: s[field] for field in SNAPSHOT_FIELDS},
+                }
+                for pos, (team_id, s) in enumerate(table, start=1)
+            )
+
+        if rows:
+            db.session.execute(StandingSnapshot.__table__.insert(), rows)
+        return len(rows)
+
+    @classmethod
+    def refresh_after_result(cls, season_id: int, matchday: int) -> int:
+        """
+        Update snapshots after one recorded result, once the standings rows
+        are up to date. With no results on later matchdays (the usual case)
+        the matchday's table is the current standings, so it is copied from
+        them without reloading the season; a correction to an earlier
+        matchday rebuilds it and every later one. Does not commit.
+
+        Returns:
+            Number of snapshot rows written
+        """
+        later = (
+            db.session.query(Match.id)
+            .filter(
+                Match.season_id == season_id,
+                Match.is_played.is_(True),
+                Match.matchday > matchday,
+            )
+            .first()
+        )
+        if later is not None:
+            return cls.refresh_from(season_id, matchday)
+
+        rows = [
+            {"season_id": season_id, "matchday": matchday, **row._asdict()}
+            for row in db.session.query(
+                Standing.team_id,
+                Standing.position,
+                *(getattr(Standing, field) for field in SNAPSHOT_FIELDS),
+            ).filter(Standing.season_id == season_id)
+        ]
+        StandingSnapshot.query.filter(
+            StandingSnapshot.season_id == season_id,
+            StandingSnapshot.matchday >= matchday,
+        ).delete(synchronize_session=False)
+        if rows:
+            db.session.execute(StandingSnapshot.__table__.insert(), rows)
+        return len(rows)
+
+    @classmethod
+    def backfill(cls, season_id: int) -> int:
+        """
+        Build all snapshots for a season from scratch and commit.
+
+        Returns:
+            Number of snapshot rows written
+        """
+        written = cls.refresh_from(season_id, 0)
+        CacheService.bump(season_id)
+        db.session.commit()
+        return written
+
+    @staticmethod
+    def table_as_of(season_id: int, matchday: int) -> tuple:
+        """
+        Snapshot table after a matchday (latest snapshot at or before it).
+
+        Returns:
+            (snapshot matchday or None, rows in position order, {team_id: previous position})
+        """
+        snapshot_md = (
+            db.session.query(db.func.max(StandingSnapshot.matchday))
+            .filter(
+                StandingSnapshot.season_id == season_id,
+                StandingSnapshot.matchday <= matchday,
+            )
+            .scalar()
+        )
+        if snapshot_md is None:
+            return None, [], {}
+
+        rows = (
+            StandingSnapshot.query.options(joinedload(StandingSnapshot.team))
+            .filter_by(season_id=season_id, matchday=snapshot_md)
+            .order_by(StandingSnapshot.position)
+            .all()
+        )
+        previous_md = (
+            db.session.query(db.func.max(StandingSnapshot.matchday))
+            .filter(
+                StandingSnapshot.season_id == season_id,
+                StandingSnapshot.matchday < snapshot_md,
+            )
+            .scalar()
+        )
+        previous = {}
+        if previous_md is not None:
+            previous = dict(
+                db.session.query(StandingSnapshot.team_id, StandingSnapshot.position)
+                .filter_by(season_id=season_id, matchday=previous_md)
+                .all()
+            )
+        return snapshot_md, rows, previous
+
+    @staticmethod
+    def team_history(season_id: int, team_id: int) -> list:
+        """Position and points after each matchday for one team."""
+        return (
+            db.session.query(
+                StandingSnapshot.matchday,
+                StandingSnapshot.position,
+                StandingSnapshot.points,
+            )
+            .filter_by(season_id=season_id, team_id=team_id)
+            .order_by(StandingSnapshot.matchday)
+            .all()
+        )
+
+    @staticmethod
+    def _load_played_matches(season_id: int) -> list:
+        """(matchday, home, away, home_goals, away_goals) for played matches, most recent first."""
+        rows = (
+            db.session.query(
+                Match.matchday,
+                Match.home_team_id,
+                Match.away_team_id,
+                Match.home_goals,
+                Match.away_goals,
+            )
+            .filter(
+                Match.season_id == season_id,
+                Match.is_played.is_(True),
+                Match.home_goals.isnot(None),
+                Match.away_goals.isnot(None),
+            )
+            .order_by(Match.kickoff.desc())
+            .all()
+        )
+        return [tuple(r) for r in rows]
@@ -0,0 +1,144 @@
+"""
+Vectorized standings engine - NumPy implementation of the league table.
+Produces the same ordering as StandingsService._rank_teams/_head_to_head_rank,
+but aggregates column arrays instead of looping over matches in Python.
+Optional: requires numpy (STANDINGS_ENGINE = "numpy").
+"""
+
+import numpy as np
+
+# Indexed by sign(goals_for - goals_against) + 1
+FORM_LETTERS = np.array(["L", "D", "W"])
+
+
+def rank_table(
+    matches: list,
+    team_ids: list,
+    points_win: int = 3,
+    points_draw: int = 1,
+    points_loss: int = 0,
+    form_length: int = 5,
+) -> list:
+    """
+    Build the ordered league table with vectorized operations.
+
+    Args:
+        matches: (home_team_id, away_team_id, home_goals, away_goals), most recent first
+        team_ids: Teams in the season
+
+    Returns:
+        List of (team_id, stats dict) in table order
+    """
+    tids = np.asarray(team_ids, dtype=np.int64)
+    n = len(tids)
+    if n == 0:
+        return []
+
+    data = np.asarray(matches, dtype=np.int64).reshape(-1, 4)
+    home, away, hg, ag = data[:, 0], data[:, 1], data[:, 2], data[:, 3]
+    home_idx, home_in = _dense_index(home, tids)
+    away_idx, away_in = _dense_index(away, tids)
+
+    # Table stats: only matches between two teams of the season
+    both = home_in & away_in
+    h, a = home_idx[both], away_idx[both]
+    g_h, g_a = hg[both], ag[both]
+    home_win = g_h > g_a
+    away_win = g_a > g_h
+    draw = g_h == g_a
+
+    played = _count(h, n) + _count(a, n)
+    won = _count(h[home_win], n) + _count(a[away_win], n)
+    drawn = _count(h[draw], n) + _count(a[draw], n)
+    lost = played - won - drawn
+    goals_for = _count(h, n, g_h) + _count(a, n, g_a)
+    goals_against = _count(h, n, g_a) + _count(a, n, g_h)
+    goal_difference = goals_for - goals_against
+    points = won * points_win + drawn * points_draw
+
+    form = _form_strings(home_idx, away_idx, home_in, away_in, hg, ag, n, form_length)
+
+    # Primary sort: points, GD, GF desc, then team id (np.lexsort: last key is primary)
+    order = np.lexsort((tids, -goals_for, -goal_difference, -points))
+
+    # Head-to-head for groups level on points, GD and GF: label every team with
+    # its tie group, keep matches played inside a group and rank all groups at
+    # once (teams in different groups already differ on the primary keys)
+    keys = np.stack((points, goal_difference, goals_for), axis=1)[order]
+    group = np.empty(n, dtype=np.int64)
+    group[order] = np.concatenate(([0], np.cumsum(np.any(keys[1:] != keys[:-1], axis=1))))
+    m = group[h] == group[a]
+    hm, am = h[m], a[m]
+    gh_m, ga_m = g_h[m], g_a[m]
+    home_pts = np.where(home_win[m], points_win, np.where(draw[m], points_draw, points_loss))
+    away_pts = np.where(away_win[m], points_win, np.where(draw[m], points_draw, points_loss))
+    h2h_pts = _count(hm, n, home_pts) + _count(am, n, away_pts)
+    h2h_gf = _count(hm, n, gh_m) + _count(am, n, ga_m)
+    h2h_gd = h2h_gf - _count(hm, n, ga_m) - _count(am, n, gh_m)
+    order = np.lexsort(
+        (tids, -h2h_gf, -h2h_gd, -h2h_pts, -goals_for, -goal_difference, -points)
+    )
+
+    return [
+        (
+            int(tids[i]),
+            {
+                "played": int(played[i]),
+                "won": int(won[i]),
+                "drawn": int(drawn[i]),
+                "lost": int(lost[i]),
+                "goals_for": int(goals_for[i]),
+                "goals_against": int(goals_against[i]),
+                "goal_difference": int(goal_difference[i]),
+                "points": int(points[i]),
+                "form": form[i],
+            },
+        )
+        for i in order
+    ]
+
+
+def _dense_index(ids: np.ndarray, tids: np.ndarray) -> tuple:
+    """Map team ids to positions in tids. Returns (index, found mask)."""
+    sorter = np.argsort(tids)
+    sorted_tids = tids[sorter]
+    pos = np.minimum(np.searchsorted(sorted_tids, ids), len(tids) - 1)
+    return sorter[pos], sorted_tids[pos] == ids
+
+
+def _count(idx: np.ndarray, n: int, weights: np.ndarray | None = None) -> np.ndarray:
+    """Per-team count (or weighted sum) as int64."""
+    if weights is None:
+        return np.bincount(idx, minlength=n).astype(np.int64)
+    return np.bincount(idx, weights=weights, minlength=n).astype(np.int64)
+
+
+def _form_strings(
+    home_idx: np.ndarray,
+    away_idx: np.ndarray,
+    home_in: np.ndarray,
+    away_in: np.ndarray,
+    hg: np.ndarray,
+    ag: np.ndarray,
+    n: int,
+    form_length: int,
+) -> list:
+    """Last form_length results per team as "W"/"D"/"L" strings, most recent first."""
+    match_order = np.arange(len(hg))
+    side_team = np.concatenate((home_idx[home_in], away_idx[away_in]))
+    side_order = np.concatenate((match_order[home_in], match_order[away_in]))
+    side_result = np.concatenate((np.sign(hg - ag)[home_in], np.sign(ag - hg)[away_in])) + 1
+
+    # Group by team, most recent first within each team
+    o = np.lexsort((side_order, side_team))
+    team_sorted = side_team[o]
+    rank = np.arange(len(o)) - np.searchsorted(team_sorted, team_sorted)
+    keep = rank < form_length
+    kept_teams = team_sorted[keep]
+    letters = FORM_LETTERS[side_result[o][keep]]
+
+    # One row of letters per team, padded with empty strings, read back as
+    # fixed-width strings (numpy drops the trailing padding)
+    grid = np.full((n, form_length), "", dtype="<U1")
+    grid[kept_teams, rank[keep]] = letters
+    return grid.view(f"<U{form_length}").ravel().tolist()
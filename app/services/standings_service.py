@@ -1,11 +1,33 @@
 """
 Standings service - calculates and updates league table.
 Ranking: 1) Points 2) Goal difference 3) Goals scored 4) Head-to-head
+
+Two update paths:
+- update_standings: full-season recompute (fallback and source of truth)
+- apply_match_result: incremental - applies one match's delta to the two
+  affected teams, re-ranks in memory and touches only changed rows
 """
 
 from collections import defaultdict
+from flask import current_app
+from sqlalchemy import and_, case, func, or_, select, union_all
 from app.extensions import db
 from app.models import Season, Team, Match, Standing
+from app.services.cache_service import CacheService
+
+
+# Standing columns written by the service (besides position/previous_position)
+STAT_FIELDS = (
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+    "points",
+    "form",
+)
 
 
 class StandingsService:
@@ -15,21 +37,241 @@ class StandingsService:
     POINTS_DRAW = 1
     POINTS_LOSS = 0
 
+    FORM_LENGTH = 5
+
     @classmethod
-    def update_standings(cls, season_id: int) -> None:
+    def update_standings(cls, season_id: int) -> int:
         """
         Recalculate standings for a season.
         Transaction-safe: all updates in single transaction.
-        
+
         Args:
             season_id: Season to update standings for
+
+        Returns:
+            Number of standing rows actually written
+        """
+        written = cls.recompute_standings(season_id)
+        CacheService.bump(season_id)
+        db.session.commit()
+        return written
+
+    @classmethod
+    def compute_standings(cls, season_id: int) -> list:
+        """
+        Compute the full league table from played matches without persisting it.
+
+        Returns:
+            List of (team_id, stats dict) in table order
         """
         season = Season.query.get_or_404(season_id)
-        
-        # Get teams in this season
         team_ids = [t.id for t in season.teams]
         if not team_ids:
-            return
+            return []
+
+        engine = cls._resolve_engine(None, len(team_ids))
+        if engine == "sql":
+            # Aggregation in the database; only the tie-break runs in Python
+            stats = cls._aggregate_stats_sql(season_id, team_ids)
+            cls._load_tied_head_to_head(season_id, team_ids, stats)
+            return [(tid, stats[tid]) for tid in cls._rank_teams(team_ids, stats)]
+
+        matches = cls._load_played_matches(season_id)
+        return cls.rank_table(matches, team_ids, engine)
+
+    @classmethod
+    def rank_table(cls, matches: list, team_ids: list, engine: str | None = None) -> list:
+        """
+        Build the ordered league table from played match rows.
+
+        Args:
+            matches: (home_team_id, away_team_id, home_goals, away_goals), most recent first
+            team_ids: Teams in the season
+            engine: "python" or "numpy" (default: STANDINGS_ENGINE config, Python loop otherwise;
+                an explicit "numpy" is used whatever the team count)
+
+        Returns:
+            List of (team_id, stats dict) in table order
+        """
+        if cls._resolve_engine(engine, len(team_ids)) == "numpy":
+            from app.services.standings_numpy import rank_table
+
+            return rank_table(
+                matches,
+                team_ids,
+                points_win=cls.POINTS_WIN,
+                points_draw=cls.POINTS_DRAW,
+                points_loss=cls.POINTS_LOSS,
+                form_length=cls.FORM_LENGTH,
+            )
+
+        stats = cls._aggregate_stats(matches, team_ids)
+        return [(tid, stats[tid]) for tid in cls._rank_teams(team_ids, stats)]
+
+    @classmethod
+    def _resolve_engine(cls, engine: str | None, num_teams: int | None = None) -> str:
+        """
+        Pick the table engine: "sql", "python" or "numpy".
+        "auto" uses SQL aggregation when the database supports window
+        functions (PostgreSQL, SQLite >= 3.25), else the Python loop.
+        numpy is only used if requested and installed; when it comes from
+        config, seasons below STANDINGS_NUMPY_MIN_TEAMS use the Python loop.
+        """
+        if engine is None:
+            engine = current_app.config.get("STANDINGS_ENGINE", "auto")
+            if (
+                engine == "numpy"
+                and num_teams is not None
+                and num_teams < current_app.config.get("STANDINGS_NUMPY_MIN_TEAMS", 20)
+            ):
+                return "python"
+        if engine == "auto":
+            engine = "sql" if cls._sql_engine_supported() else "python"
+        if engine == "numpy":
+            try:
+                import numpy  # noqa: F401
+            except ImportError:
+                return "python"
+        return engine
+
+    @staticmethod
+    def _sql_engine_supported() -> bool:
+        """Whether the bound database supports the window functions used by the SQL engine."""
+        dialect = db.engine.dialect
+        if dialect.name == "postgresql":
+            return True
+        if dialect.name == "sqlite":
+            return (dialect.server_version_info or (0,)) >= (3, 25)
+        return False
+
+    @classmethod
+    def recompute_standings(cls, season_id: int) -> int:
+        """Full recompute, upserting only changed rows (no commit). Returns rows written."""
+        table = cls.compute_standings(season_id)
+        if not table:
+            return 0
+
+        written = cls._upsert_standings(season_id, table)
+        cls._log_writes(season_id, "full", written, len(table))
+        return written
+
+    @classmethod
+    def _upsert_standings(cls, season_id: int, table: list) -> int:
+        """
+        Persist a computed table with INSERT ... ON CONFLICT (season_id, team_id)
+        DO UPDATE, skipping rows whose values are unchanged. Rows for teams no
+        longer in the season are removed. Returns the number of rows written.
+        """
+        dialect = db.engine.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            return cls._merge_standings(season_id, table)
+
+        t = Standing.__table__
+        stmt = insert(t).values([
+            {
+                "season_id": season_id,
+                "team_id": team_id,
+                "position": pos,
+                "previous_position": None,
+                **{field: s[field] for field in STAT_FIELDS},
+            }
+            for pos, (team_id, s) in enumerate(table, start=1)
+        ])
+        excluded = stmt.excluded
+        conflict = (
+            {"constraint": "uq_standing_season_team"}
+            if dialect == "postgresql"
+            else {"index_elements": ["season_id", "team_id"]}
+        )
+        stmt = stmt.on_conflict_do_update(
+            **conflict,
+            set_={
+                "position": excluded.position,
+                "previous_position": t.c.position,
+                **{field: excluded[field] for field in STAT_FIELDS},
+            },
+            # Same rule as the incremental path: previous_position becomes
+            # the old position, so a row is unchanged only if it already equals it
+            where=or_(
+                t.c.position.is_distinct_from(excluded.position),
+                t.c.previous_position.is_distinct_from(t.c.position),
+                *[t.c[field].is_distinct_from(excluded[field]) for field in STAT_FIELDS],
+            ),
+        )
+        written = db.session.execute(stmt).rowcount
+
+        team_ids = [team_id for team_id, _ in table]
+        written += Standing.query.filter(
+            Standing.season_id == season_id,
+            Standing.team_id.notin_(team_ids),
+        ).delete(synchronize_session=False)
+        return written
+
+    @classmethod
+    def _merge_standings(cls, season_id: int, table: list) -> int:
+        """ORM fallback for databases without ON CONFLICT: update changed rows in place."""
+        rows = {
+            s.team_id: s
+            for s in Standing.query.filter_by(season_id=season_id).all()
+        }
+        written = 0
+        for pos, (team_id, s) in enumerate(table, start=1):
+            values = {field: s[field] for field in STAT_FIELDS}
+            values["position"] = pos
+            row = rows.pop(team_id, None)
+            if row is None:
+                db.session.add(Standing(season_id=season_id, team_id=team_id, **values))
+                written += 1
+                continue
+            values["previous_position"] = row.position
+            if cls._assign_if_changed(row, values):
+                written += 1
+        for row in rows.values():
+            db.session.delete(row)
+            written += 1
+        db.session.flush()
+        return written
+
+    @staticmethod
+    def _log_writes(season_id: int, mode: str, written: int, total: int) -> None:
+        """Record standings write amplification (rows written vs rows in the table)."""
+        current_app.logger.info(
+            "standings %s update season=%s rows_written=%s/%s",
+            mode,
+            season_id,
+            written,
+            total,
+        )
+
+    @staticmethod
+    def _load_played_matches(season_id: int) -> list:
+        """Played match scores as plain tuples, most recent first (one query, no ORM objects)."""
+        rows = (
+            db.session.query(
+                Match.home_team_id,
+                Match.away_team_id,
+                Match.home_goals,
+                Match.away_goals,
+            )
+            .filter(
+                Match.season_id == season_id,
+                Match.is_played.is_(True),
+                Match.home_goals.isnot(None),
+                Match.away_goals.isnot(None),
+            )
+            .order_by(Match.kickoff.desc())
+            .all()
+        )
+        return [tuple(r) for r in rows]
+
+    @classmethod
+    def _aggregate_stats(cls, matches: list, team_ids: list) -> dict:
+        """Aggregate per-team stats and head-to-head records from played matches."""
+        team_set = set(team_ids)
 
         # Initialize stats per team
         stats = {
@@ -45,45 +287,35 @@ class StandingsService:
             for tid in team_ids
         }
 
-        # Process played matches
-        matches = Match.query.filter_by(
-            season_id=season_id,
-            is_played=True,
-        ).filter(
-            Match.home_goals.isnot(None),
-            Match.away_goals.isnot(None),
-        ).all()
-
-        for match in matches:
-            if match.home_team_id not in team_ids or match.away_team_id not in team_ids:
+        for home_id, away_id, hg, ag in matches:
+            if home_id not in team_set or away_id not in team_set:
                 continue
 
-            hg, ag = match.home_goals, match.away_goals
-            stats[match.home_team_id]["played"] += 1
-            stats[match.away_team_id]["played"] += 1
-            stats[match.home_team_id]["goals_for"] += hg
-            stats[match.home_team_id]["goals_against"] += ag
-            stats[match.away_team_id]["goals_for"] += ag
-            stats[match.away_team_id]["goals_against"] += hg
+            stats[home_id]["played"] += 1
+            stats[away_id]["played"] += 1
+            stats[home_id]["goals_for"] += hg
+            stats[home_id]["goals_against"] += ag
+            stats[away_id]["goals_for"] += ag
+            stats[away_id]["goals_against"] += hg
 
             if hg > ag:
-                stats[match.home_team_id]["won"] += 1
-                stats[match.away_team_id]["lost"] += 1
-                stats[match.home_team_id]["matches"].append((match.away_team_id, 3, hg, ag))
-                stats[match.away_team_id]["matches"].append((match.home_team_id, 0, ag, hg))
+                stats[home_id]["won"] += 1
+                stats[away_id]["lost"] += 1
+                stats[home_id]["matches"].append((away_id, 3, hg, ag))
+                stats[away_id]["matches"].append((home_id, 0, ag, hg))
             elif ag > hg:
-                stats[match.away_team_id]["won"] += 1
-                stats[match.home_team_id]["lost"] += 1
-                stats[match.away_team_id]["matches"].append((match.home_team_id, 3, ag, hg))
-                stats[match.home_team_id]["matches"].append((match.away_team_id, 0, hg, ag))
+                stats[away_id]["won"] += 1
+                stats[home_id]["lost"] += 1
+                stats[away_id]["matches"].append((home_id, 3, ag, hg))
+                stats[home_id]["matches"].append((away_id, 0, hg, ag))
             else:
-                stats[match.home_team_id]["drawn"] += 1
-                stats[match.away_team_id]["drawn"] += 1
-                stats[match.home_team_id]["matches"].append((match.away_team_id, 1, hg, ag))
-                stats[match.away_team_id]["matches"].append((match.home_team_id, 1, ag, hg))
+                stats[home_id]["drawn"] += 1
+                stats[away_id]["drawn"] += 1
+                stats[home_id]["matches"].append((away_id, 1, hg, ag))
+                stats[away_id]["matches"].append((home_id, 1, ag, hg))
 
         # Build form (last 5 matches) per team
-        form_map = cls._build_form_map(season_id, team_ids)
+        form_map = cls._build_form_map(matches, team_ids)
 
         # Compute points, goal diff
         for tid in team_ids:
@@ -92,74 +324,307 @@ class StandingsService:
             s["goal_difference"] = s["goals_for"] - s["goals_against"]
             s["form"] = form_map.get(tid, "")
 
-        # Sort: points, GD, GF, then head-to-head
-        sorted_teams = cls._rank_teams(team_ids, stats)
+        return stats
+
+    @classmethod
+    def _aggregate_stats_sql(cls, season_id: int, team_ids: list) -> dict:
+        """
+        Per-team table stats and last-5 form from one aggregate query.
+        Each match contributes a home and an away side (UNION ALL); a
+        ROW_NUMBER window numbers each team's sides by kickoff for form.
+        Form comes back packed as base-4 digits (1=L, 2=D, 3=W, most recent
+        in the lowest digit) so no ordered string aggregation is needed.
+        """
+        counted = case(
+            (and_(Match.home_team_id.in_(team_ids), Match.away_team_id.in_(team_ids)), 1),
+            else_=0,
+        )
+        base = (
+            Match.season_id == season_id,
+            Match.is_played.is_(True),
+            Match.home_goals.isnot(None),
+            Match.away_goals.isnot(None),
+            or_(Match.home_team_id.in_(team_ids), Match.away_team_id.in_(team_ids)),
+        )
+        sides = union_all(
+            select(
+                Match.home_team_id.label("team_id"),
+                Match.home_goals.label("gf"),
+                Match.away_goals.label("ga"),
+                Match.kickoff.label("kickoff"),
+                counted.label("counted"),
+            ).where(*base),
+            select(
+                Match.away_team_id,
+                Match.away_goals,
+                Match.home_goals,
+                Match.kickoff,
+                counted,
+            ).where(*base),
+        ).subquery("sides")
+
+        ranked = select(
+            sides.c.team_id,
+            sides.c.gf,
+            sides.c.ga,
+            sides.c.counted,
+            func.row_number()
+            .over(partition_by=sides.c.team_id, order_by=sides.c.kickoff.desc())
+            .label("rn"),
+        ).subquery("ranked")
+
+        c = ranked.c
+        is_counted = c.counted == 1
+        result_digit = case((c.gf > c.ga, 3), (c.gf == c.ga, 2), else_=1)
+        form_code = case(
+            *[(c.rn == i + 1, result_digit * 4 ** i) for i in range(cls.FORM_LENGTH)],
+            else_=0,
+        )
+        query = (
+            select(
+                c.team_id,
+                func.sum(c.counted),
+                func.sum(case((and_(is_counted, c.gf > c.ga), 1), else_=0)),
+                func.sum(case((and_(is_counted, c.gf == c.ga), 1), else_=0)),
+                func.sum(case((and_(is_counted, c.gf < c.ga), 1), else_=0)),
+                func.sum(case((is_counted, c.gf), else_=0)),
+                func.sum(case((is_counted, c.ga), else_=0)),
+                func.sum(form_code),
+            )
+            .where(c.team_id.in_(team_ids))
+            .group_by(c.team_id)
+        )
+
+        stats = {
+            tid: {
+                "played": 0,
+                "won": 0,
+                "drawn": 0,
+                "lost": 0,
+                "goals_for": 0,
+                "goals_against": 0,
+                "form": "",
+                "matches": [],  # filled for tied teams by _load_tied_head_to_head
+            }
+            for tid in team_ids
+        }
+        for tid, played, won, drawn, lost, gf, ga, code in db.session.execute(query):
+            s = stats[tid]
+            s["played"], s["won"], s["drawn"], s["lost"] = int(played), int(won), int(drawn), int(lost)
+            s["goals_for"], s["goals_against"] = int(gf), int(ga)
+            s["form"] = cls._decode_form(int(code))
+
+        for s in stats.values():
+            s["points"] = s["won"] * cls.POINTS_WIN + s["drawn"] * cls.POINTS_DRAW
+            s["goal_difference"] = s["goals_for"] - s["goals_against"]
+
+        return stats
+
+    @classmethod
+    def _decode_form(cls, code: int) -> str:
+        """Unpack base-4 form digits (see _aggregate_stats_sql) into e.g. "WWDLW"."""
+        form = []
+        for _ in range(cls.FORM_LENGTH):
+            code, digit = divmod(code, 4)
+            if not digit:
+                break
+            form.append("LDW"[digit - 1])
+        return "".join(form)
 
-        # Get existing standings for previous_position
-        existing = {
-            s.team_id: s.position
+    @classmethod
+    def apply_match_result(cls, match: Match, previous: tuple | None = None) -> int:
+        """
+        Incrementally update standings for a single recorded match.
+        Reverts the previous score (for a re-recorded match), applies the new
+        one to the two teams' rows, re-ranks in memory and updates only rows
+        whose position or numbers changed. Falls back to a full recompute when
+        the stored table is missing or incomplete. Does not commit.
+
+        Args:
+            match: Match whose result was just set (flushed)
+            previous: (home_goals, away_goals) already counted in standings, or None
+
+        Returns:
+            Number of standing rows actually written
+        """
+        season_id = match.season_id
+        season = Season.query.get_or_404(season_id)
+        team_ids = [t.id for t in season.teams]
+
+        rows = {
+            s.team_id: s
             for s in Standing.query.filter_by(season_id=season_id).all()
         }
+        affected = (match.home_team_id, match.away_team_id)
+        if (
+            set(rows) != set(team_ids)
+            or any(tid not in rows for tid in affected)
+            or match.home_goals is None
+            or match.away_goals is None
+        ):
+            return cls.recompute_standings(season_id)
 
-        # Delete old standings and insert new (in transaction)
-        Standing.query.filter_by(season_id=season_id).delete()
-
-        for pos, team_id in enumerate(sorted_teams, start=1):
-            s = stats[team_id]
-            prev = existing.get(team_id)
-            standing = Standing(
-                season_id=season_id,
-                team_id=team_id,
-                position=pos,
-                previous_position=prev,
-                played=s["played"],
-                won=s["won"],
-                drawn=s["drawn"],
-                lost=s["lost"],
-                goals_for=s["goals_for"],
-                goals_against=s["goals_against"],
-                goal_difference=s["goal_difference"],
-                points=s["points"],
-                form=s["form"],
-            )
-            db.session.add(standing)
+        stats = {
+            tid: {field: getattr(row, field) for field in STAT_FIELDS}
+            for tid, row in rows.items()
+        }
+        for s in stats.values():
+            s["matches"] = []
 
-        db.session.commit()
+        if previous is not None and None not in previous:
+            cls._apply_score(stats, match.home_team_id, match.away_team_id, *previous, sign=-1)
+        cls._apply_score(stats, match.home_team_id, match.away_team_id, match.home_goals, match.away_goals)
+
+        for tid in affected:
+            stats[tid]["form"] = cls._team_form(season_id, tid)
+
+        cls._load_tied_head_to_head(season_id, team_ids, stats)
+        ordered = cls._rank_teams(team_ids, stats)
+
+        written = 0
+        for pos, tid in enumerate(ordered, start=1):
+            row = rows[tid]
+            values = {field: stats[tid][field] for field in STAT_FIELDS}
+            values["previous_position"] = row.position
+            values["position"] = pos
+            if cls._assign_if_changed(row, values):
+                written += 1
+
+        db.session.flush()
+        cls._log_writes(season_id, "incremental", written, len(ordered))
+        return written
 
     @classmethod
-    def _build_form_map(cls, season_id: int, team_ids: list) -> dict:
-        """Build form string (W/D/L) for last 5 matches per team."""
+    def check_standings(cls, season_id: int) -> list:
+        """
+        Compare stored standings with a full recompute.
+
+        Returns:
+            List of team_ids whose stored row differs (empty if consistent)
+        """
+        rows = {
+            s.team_id: s
+            for s in Standing.query.filter_by(season_id=season_id).all()
+        }
+        mismatched = []
+        for pos, (tid, s) in enumerate(cls.compute_standings(season_id), start=1):
+            row = rows.pop(tid, None)
+            if (
+                row is None
+                or row.position != pos
+                or any(getattr(row, field) != s[field] for field in STAT_FIELDS)
+            ):
+                mismatched.append(tid)
+        mismatched.extend(rows)
+        return mismatched
+
+    @classmethod
+    def _apply_score(
+        cls,
+        stats: dict,
+        home_id: int,
+        away_id: int,
+        hg: int,
+        ag: int,
+        sign: int = 1,
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) one result from both teams' stats."""
+        for tid, gf, ga in ((home_id, hg, ag), (away_id, ag, hg)):
+            s = stats[tid]
+            s["played"] += sign
+            s["goals_for"] += sign * gf
+            s["goals_against"] += sign * ga
+            if gf > ga:
+                s["won"] += sign
+            elif gf < ga:
+                s["lost"] += sign
+            else:
+                s["drawn"] += sign
+            s["points"] = s["won"] * cls.POINTS_WIN + s["drawn"] * cls.POINTS_DRAW
+            s["goal_difference"] = s["goals_for"] - s["goals_against"]
+
+    @classmethod
+    def _team_form(cls, season_id: int, team_id: int) -> str:
+        """Form string for one team's last 5 played matches."""
         matches = (
             Match.query.filter_by(season_id=season_id, is_played=True)
             .filter(Match.home_goals.isnot(None), Match.away_goals.isnot(None))
+            .filter(or_(Match.home_team_id == team_id, Match.away_team_id == team_id))
             .order_by(Match.kickoff.desc())
+            .limit(cls.FORM_LENGTH)
+            .all()
+        )
+        form = []
+        for m in matches:
+            gf, ga = (m.home_goals, m.away_goals) if m.home_team_id == team_id else (m.away_goals, m.home_goals)
+            form.append("W" if gf > ga else "L" if gf < ga else "D")
+        return "".join(form)
+
+    @classmethod
+    def _load_tied_head_to_head(cls, season_id: int, team_ids: list, stats: dict) -> None:
+        """
+        Fill stats[tid]["matches"] only for teams level on points, GD and GF,
+        so head-to-head ranking works without loading the whole season.
+        """
+        groups = defaultdict(list)
+        for tid in team_ids:
+            s = stats[tid]
+            groups[(s["points"], s["goal_difference"], s["goals_for"])].append(tid)
+        tied = [tid for group in groups.values() if len(group) > 1 for tid in group]
+        if not tied:
+            return
+
+        matches = (
+            Match.query.filter_by(season_id=season_id, is_played=True)
+            .filter(Match.home_goals.isnot(None), Match.away_goals.isnot(None))
+            .filter(Match.home_team_id.in_(tied), Match.away_team_id.in_(tied))
             .all()
         )
+        for m in matches:
+            hg, ag = m.home_goals, m.away_goals
+            home_pts = cls.POINTS_WIN if hg > ag else cls.POINTS_DRAW if hg == ag else cls.POINTS_LOSS
+            away_pts = cls.POINTS_WIN if ag > hg else cls.POINTS_DRAW if hg == ag else cls.POINTS_LOSS
+            stats[m.home_team_id]["matches"].append((m.away_team_id, home_pts, hg, ag))
+            stats[m.away_team_id]["matches"].append((m.home_team_id, away_pts, ag, hg))
+
+    @staticmethod
+    def _assign_if_changed(row: Standing, values: dict) -> bool:
+        """Set attributes that differ on a standing row. Returns True if any changed."""
+        changed = False
+        for field, value in values.items():
+            if getattr(row, field) != value:
+                setattr(row, field, value)
+                changed = True
+        return changed
+
+    @classmethod
+    def _build_form_map(cls, matches: list, team_ids: list) -> dict:
+        """Build form string (W/D/L) for last 5 matches per team (matches most recent first)."""
+        team_set = set(team_ids)
 
         # Per team: list of "W"/"D"/"L" from most recent
         form_lists = defaultdict(list)
 
-        for m in matches:
-            if m.home_team_id not in team_ids and m.away_team_id not in team_ids:
+        for home_id, away_id, hg, ag in matches:
+            if home_id not in team_set and away_id not in team_set:
                 continue
 
-            hg, ag = m.home_goals, m.away_goals
-            if m.home_team_id in team_ids:
-                if len(form_lists[m.home_team_id]) < 5:
+            if home_id in team_set:
+                if len(form_lists[home_id]) < cls.FORM_LENGTH:
                     if hg > ag:
-                        form_lists[m.home_team_id].append("W")
+                        form_lists[home_id].append("W")
                     elif hg < ag:
-                        form_lists[m.home_team_id].append("L")
+                        form_lists[home_id].append("L")
                     else:
-                        form_lists[m.home_team_id].append("D")
-            if m.away_team_id in team_ids:
-                if len(form_lists[m.away_team_id]) < 5:
+                        form_lists[home_id].append("D")
+            if away_id in team_set:
+                if len(form_lists[away_id]) < cls.FORM_LENGTH:
                     if ag > hg:
-                        form_lists[m.away_team_id].append("W")
+                        form_lists[away_id].append("W")
                     elif ag < hg:
-                        form_lists[m.away_team_id].append("L")
+                        form_lists[away_id].append("L")
                     else:
-                        form_lists[m.away_team_id].append("D")
+                        form_lists[away_id].append("D")
 
         return {tid: "".join(form_lists[tid]) for tid in team_ids}
 
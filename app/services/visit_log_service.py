@@ -0,0 +1,272 @@
+"""
+Visit log service - raw hit log in monthly tables, with retention.
+
+Every tracked hit is appended to visit_log_YYYY_MM. On PostgreSQL these are
+range partitions of the visit_log parent (created by the migration); on
+other databases they are plain tables rotated by month. Once a month is
+older than the retention window its table is compacted - daily rollups
+are reconciled against the raw hits, never lowered - and then dropped, so
+the live table stays small and old data costs one rollup row per day.
+"""
+
+import re
+from datetime import date, datetime, timedelta
+
+import sqlalchemy as sa
+from flask import current_app
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models import DailyVisitRollup, HourlyVisitRollup, Visitor
+from app.models.visit_rollup import ALL_PAGES
+
+
+PARENT_TABLE = "visit_log"
+TABLE_PATTERN = re.compile(r"^visit_log_(\d{4})_(\d{2})$")
+
+# Monthly tables live outside db.metadata so create_all() leaves them alone
+_metadata = sa.MetaData()
+
+
+class VisitLogService:
+    """Service for the partitioned raw visit log."""
+
+    # Month tables known to exist in this process (committed; tables created
+    # in an open transaction wait in session.info until it commits)
+    _known_tables = set()
+    PENDING_KEY = "visit_log_pending_tables"
+
+    @classmethod
+    def append(cls, visits) -> int:
+        """
+        Insert raw hits into their monthly tables (no commit).
+
+        Args:
+            visits: Iterable of (ip_address, page_visited, user_agent, timestamp, weight)
+
+        Returns:
+            Number of hits written
+        """
+        by_month = {}
+        for ip_address, page_visited, user_agent, visited_at, weight in visits:
+            by_month.setdefault((visited_at.year, visited_at.month), []).append({
+                "visited_at": visited_at,
+                "ip_address": ip_address,
+                "page_visited": page_visited,
+                "user_agent": user_agent,
+                "weight": weight,
+            })
+        for (year, month), rows in by_month.items():
+            table = cls._ensure_table(year, month)
+            db.session.execute(table.insert(), rows)
+        return sum(len(rows) for rows in by_month.values())
+
+    @classmethod
+    def compact(cls, retention_days: int, batch_size: int = 5000) -> list:
+        """
+        Compact and drop every monthly table that ends before the retention
+        cutoff. Each day and each delete batch commits separately, so no
+        single transaction holds locks for long.
+
+        Args:
+            retention_days: Keep raw hits newer than this many days
+            batch_size: Rows deleted per transaction (non-PostgreSQL)
+
+        Returns:
+            List of (table name, hits compacted) for dropped tables
+        """
+        cutoff = datetime.utcnow().date() - timedelta(days=retention_days)
+        compacted = []
+        for name, (start, end) in sorted(cls._list_tables().items(), key=lambda item: item[1]):
+            if end > cutoff:
+                continue
+            table = _log_table(name)
+            hits = 0
+            day = start
+            while day < end:
+                hits += cls._reconcile_day(table, day)
+                day += timedelta(days=1)
+            # Hourly detail older than the raw log isn't kept either
+            HourlyVisitRollup.query.filter(
+                HourlyVisitRollup.bucket < datetime.combine(end, datetime.min.time())
+            ).delete(synchronize_session=False)
+            db.session.commit()
+
+            cls._drop_table(table, batch_size)
+            cls._known_tables.discard(name)
+            current_app.logger.info("visit log compacted table=%s hits=%s", name, hits)
+            compacted.append((name, hits))
+        return compacted
+
+    @staticmethod
+    def prune_visitors(retention_days: int, batch_size: int = 5000) -> int:
+        """
+        Delete visitor rows not seen within the retention window, batch by
+        batch (uses the last_visit index). A pruned IP counts as new again
+        in the rollups if it returns.
+
+        Returns:
+            Number of visitor rows deleted
+        """
+        cutoff = datetime.combine(
+            datetime.utcnow().date() - timedelta(days=retention_days), datetime.min.time()
+        )
+        deleted = 0
+        while True:
+            ids = [
+                vid for (vid,) in db.session.query(Visitor.id)
+                .filter(Visitor.last_visit < cutoff)
+                .limit(batch_size)
+            ]
+            if not ids:
+                return deleted
+            Visitor.query.filter(Visitor.id.in_(ids)).delete(synchronize_session=False)
+            db.session.commit()
+            deleted += len(ids)
+
+    @staticmethod
+    def _reconcile_day(table, day: date) -> int:
+        """
+        Raise the day's rollup visit counts to the raw log's totals (they
+        only differ if a rollup write was lost) and commit.
+
+        Returns:
+            Visits recorded in the raw log for the day
+        """
+        day_start = datetime.combine(day, datetime.min.time())
+        totals = dict(
+            db.session.execute(
+                sa.select(table.c.page_visited, sa.func.sum(table.c.weight))
+                .where(
+                    table.c.visited_at >= day_start,
+                    table.c.visited_at < day_start + timedelta(days=1),
+                )
+                .group_by(table.c.page_visited)
+            ).all()
+        )
+        if not totals:
+            return 0
+        totals[ALL_PAGES] = sum(totals.values())
+
+        rows = {
+            r.page: r
+            for r in DailyVisitRollup.query.filter(
+                DailyVisitRollup.bucket == day,
+                DailyVisitRollup.page.in_(totals),
+            )
+        }
+        for page, visits in totals.items():
+            rollup = rows.get(page)
+            if rollup is None:
+                db.session.add(DailyVisitRollup(
+                    bucket=day, page=page, visits=visits, unique_visitors=0, new_visitors=0
+                ))
+            elif rollup.visits < visits:
+                rollup.visits = visits
+        db.session.commit()
+        return totals[ALL_PAGES]
+
+    @staticmethod
+    def _drop_table(table, batch_size: int) -> None:
+        """Drop a compacted month table (detach first on PostgreSQL)."""
+        preparer = db.engine.dialect.identifier_preparer
+        if db.engine.dialect.name == "postgresql":
+            db.session.execute(sa.text(
+                f"ALTER TABLE {preparer.quote(PARENT_TABLE)} DETACH PARTITION {preparer.quote(table.name)}"
+            ))
+            db.session.execute(sa.text(f"DROP TABLE {preparer.quote(table.name)}"))
+            db.session.commit()
+            return
+
+        # Empty it in short transactions first so the final DROP is quick
+        while True:
+            batch = sa.select(table.c.visited_at).order_by(table.c.visited_at).limit(batch_size)
+            oldest = db.session.execute(batch.offset(batch_size - 1)).scalar()
+            if oldest is None:
+                break
+            db.session.execute(table.delete().where(table.c.visited_at <= oldest))
+            db.session.commit()
+        db.session.execute(sa.text(f"DROP TABLE {preparer.quote(table.name)}"))
+        db.session.commit()
+
+    @classmethod
+    def _ensure_table(cls, year: int, month: int) -> sa.Table:
+        """Month table for a hit, created on first use."""
+        name = f"visit_log_{year:04d}_{month:02d}"
+        table = _log_table(name)
+        pending = db.session.info.setdefault(cls.PENDING_KEY, set())
+        if name in cls._known_tables or name in pending:
+            return table
+
+        try:
+            with db.session.begin_nested():
+                if db.engine.dialect.name == "postgresql":
+                    start, end = _month_range(year, month)
+                    preparer = db.engine.dialect.identifier_preparer
+                    db.session.execute(sa.text(
+                        f"CREATE TABLE IF NOT EXISTS {preparer.quote(name)} "
+                        f"PARTITION OF {preparer.quote(PARENT_TABLE)} "
+                        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                    ))
+                else:
+                    table.create(bind=db.session.connection(), checkfirst=True)
+        except DBAPIError:
+            # Fine if another worker created it concurrently (and committed, so
+            # it exists whatever happens to this transaction); anything else is
+            # a real failure and must not be remembered as an existing table
+            if not sa.inspect(db.session.connection()).has_table(name):
+                raise
+            cls._known_tables.add(name)
+            return table
+        # DDL is transactional: only known once the writer's commit succeeds
+        pending.add(name)
+        return table
+
+    @staticmethod
+    def _list_tables() -> dict:
+        """{table name: (first day, first day of next month)} for existing month tables."""
+        tables = {}
+        for name in sa.inspect(db.engine).get_table_names():
+            match = TABLE_PATTERN.match(name)
+            if match:
+                tables[name] = _month_range(int(match.group(1)), int(match.group(2)))
+        return tables
+
+
+@sa.event.listens_for(Session, "after_commit")
+def _remember_created_tables(session):
+    # Also fired for savepoints; only the outer commit makes the DDL durable
+    if not session.in_nested_transaction():
+        VisitLogService._known_tables.update(session.info.pop(VisitLogService.PENDING_KEY, ()))
+
+
+@sa.event.listens_for(Session, "after_soft_rollback")
+def _forget_created_tables(session, previous_transaction):
+    # A savepoint rollback leaves the outer transaction (and its tables) alive
+    if not previous_transaction.nested:
+        session.info.pop(VisitLogService.PENDING_KEY, None)
+
+
+def _month_range(year: int, month: int) -> tuple:
+    """(first day of the month, first day of the next month)."""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+
+def _log_table(name: str) -> sa.Table:
+    """Core table object for one month of the raw log."""
+    table = _metadata.tables.get(name)
+    if table is None:
+        table = sa.Table(
+            name,
+            _metadata,
+            sa.Column("visited_at", sa.DateTime, nullable=False),
+            sa.Column("ip_address", sa.String(45), nullable=False),
+            sa.Column("page_visited", sa.String(255), nullable=False),
+            sa.Column("user_agent", sa.Text),
+            sa.Column("weight", sa.Integer, nullable=False, default=1),
+            sa.Index(f"ix_{name}_visited_at", "visited_at"),
+        )
+    return table
@@ -1,99 +1,603 @@
 """
 Visitor tracking service for analytics.
+
+Tracking is write-behind: the request hook only puts the hit on a bounded
+in-memory queue, and a background thread in each worker process flushes
+the queue in batches (on a timer, or early once VISITOR_FLUSH_BATCH hits
+are waiting). Duplicate (ip, page) hits are merged before writing. Hits
+that arrive while the queue is full are dropped and counted.
+
+A policy step in front of the queue skips excluded endpoints (static files
+and uploaded images by default) and bots, and can sample hits, with each
+kept hit counted as 1/rate visits.
+
+Each flush also adds its hits to hourly and daily rollup tables and merges
+the visitor IPs into HyperLogLog sketches per day and endpoint; the
+analytics dashboard and time series read only those. Raw per-(ip, page)
+Visitor rows are optional (VISITOR_RAW_ROWS); raw hits also go to the
+monthly visit log (see visit_log_service).
 """
 
+import atexit
+import os
+import queue
+import random
+import re
+import threading
 from datetime import datetime, timedelta
-from flask import request, g
+from functools import lru_cache
+from flask import current_app, request, g
+from sqlalchemy import case
 from app.extensions import db
-from app.models import Visitor
+from app.models import Visitor, HourlyVisitRollup, DailyVisitRollup, VisitSketch
+from app.models.visit_rollup import ALL_PAGES, ALL_TIME
+from app.services.hyperloglog import HyperLogLog
+from app.services.visit_log_service import VisitLogService
+
+
+# Rollup counters, added together on conflict
+ROLLUP_COLUMNS = ('visits', 'unique_visitors', 'new_visitors')
+
+# Bot classification: parsed UAs are cached (bounded LRU), keyed on the
+# first UA_MAX_LENGTH characters so oversized headers can't bloat the cache
+BOT_PATTERN = re.compile(
+    r'bot|crawl|spider|slurp|scrape|fetch|monitor|preview|headless|lighthouse'
+    r'|curl|wget|python-requests|python-urllib|httpx|aiohttp|go-http-client'
+    r'|java/|okhttp|libwww|facebookexternalhit|bingpreview',
+    re.IGNORECASE,
+)
+UA_CACHE_SIZE = 4096
+UA_MAX_LENGTH = 512
+
+# Requests the tracking policy turned away in this process
+_policy_counters = {'skipped': 0, 'bots': 0, 'sampled_out': 0}
+_policy_counters_lock = threading.Lock()
+
+
+def _count_policy(name):
+    # += on a shared dict is not atomic across gthread workers
+    with _policy_counters_lock:
+        _policy_counters[name] += 1
 
 
 def track_visitor():
-    """Track visitor information."""
+    """Queue the current request's visit (no database work on the request path)."""
     try:
-        # Get visitor information
-        ip_address = get_client_ip()
-        user_agent = request.headers.get('User-Agent', 'Unknown')
+        app = current_app._get_current_object()
         page_visited = request.endpoint or 'unknown'
-        
-        # Check if visitor exists
-        existing_visitor = Visitor.query.filter_by(
-            ip_address=ip_address,
-            page_visited=page_visited
-        ).first()
-        
-        if existing_visitor:
-            # Update existing visitor
-            existing_visitor.last_visit = datetime.utcnow()
-            existing_visitor.visit_count += 1
-            existing_visitor.is_unique = False  # Not unique on subsequent visits
+        user_agent = request.headers.get('User-Agent', 'Unknown')
+        weight = tracking_weight(app.config, page_visited, user_agent)
+        if not weight:
+            return
+
+        visit = (get_client_ip(), page_visited, user_agent, datetime.utcnow(), weight)
+        if app.config.get('VISITOR_TRACKING', 'buffered') == 'sync':
+            # Testing / debugging: write immediately, same merge path as the flusher
+            write_visits([visit])
         else:
-            # Create new visitor record
-            visitor = Visitor(
-                ip_address=ip_address,
-                user_agent=user_agent,
-                page_visited=page_visited,
-                first_visit=datetime.utcnow(),
-                last_visit=datetime.utcnow(),
-                visit_count=1,
-                is_unique=True
-            )
-            db.session.add(visitor)
-        
-        db.session.commit()
-        
+            _get_buffer(app).put(visit)
+
         # Store in g for potential use in templates
         g.visitor_tracked = True
-        
+
     except Exception:
         # Don't let tracking errors break the app
         db.session.rollback()
-        pass
+
+
+def tracking_weight(config, page_visited, user_agent):
+    """
+    Tracking policy: how many visits this request counts for.
+
+    Endpoints outside VISITOR_TRACK_ENDPOINTS (when set) or inside
+    VISITOR_SKIP_ENDPOINTS are not tracked, nor are bots unless
+    VISITOR_TRACK_BOTS. With VISITOR_SAMPLE_RATE below 1, a kept hit
+    stands for 1/rate visits (randomly rounded, so totals stay unbiased).
+
+    Returns:
+        Visit count to record, 0 to skip the request
+    """
+    allowed = config.get('VISITOR_TRACK_ENDPOINTS')
+    if allowed is not None and page_visited not in allowed:
+        _count_policy('skipped')
+        return 0
+    if page_visited in config.get('VISITOR_SKIP_ENDPOINTS', ()):
+        _count_policy('skipped')
+        return 0
+    if not config.get('VISITOR_TRACK_BOTS', False) and is_bot(user_agent[:UA_MAX_LENGTH]):
+        _count_policy('bots')
+        return 0
+
+    rate = config.get('VISITOR_SAMPLE_RATE', 1.0)
+    if rate >= 1:
+        return 1
+    if rate <= 0 or random.random() >= rate:
+        _count_policy('sampled_out')
+        return 0
+    scale = 1 / rate
+    whole = int(scale)
+    return whole + (random.random() < scale - whole)
+
+
+@lru_cache(maxsize=UA_CACHE_SIZE)
+def is_bot(user_agent):
+    """Classify a user agent as a crawler/script (cached; callers truncate the UA)."""
+    if not user_agent or user_agent == 'Unknown':
+        return True
+    return BOT_PATTERN.search(user_agent) is not None
+
+
+def write_visits(visits):
+    """
+    Merge visits by (ip, page) and write them, plus the hourly/daily
+    rollups, unique-visitor sketches and raw log, in one transaction.
+
+    Args:
+        visits: Iterable of (ip_address, page_visited, user_agent, timestamp, weight)
+
+    Returns:
+        Number of distinct (ip, page) pairs written
+    """
+    visits = sorted(visits, key=lambda v: v[3])
+    if not visits:
+        return 0
+
+    merged = {}
+    for ip_address, page_visited, user_agent, visited_at, weight in visits:
+        entry = merged.setdefault((ip_address, page_visited), [user_agent, visited_at, visited_at, 0])
+        entry[2] = visited_at
+        entry[3] += weight
+
+    if current_app.config.get('VISITOR_RAW_ROWS', True):
+        # Per-IP history for the rollups' unique counts: one SELECT for the
+        # whole batch, served by the (ip_address, page_visited) index
+        ips = {v[0] for v in visits}
+        pair_last = {
+            (ip_address, page_visited): last_visit
+            for ip_address, page_visited, last_visit in db.session.query(
+                Visitor.ip_address, Visitor.page_visited, Visitor.last_visit
+            ).filter(Visitor.ip_address.in_(ips))
+        }
+        ip_last = {}
+        for (ip_address, _), last_visit in pair_last.items():
+            ip_last[ip_address] = max(ip_last.get(ip_address, last_visit), last_visit)
+        _upsert_visitor_rows(merged)
+    else:
+        # No per-IP history: rollups keep visit counts, sketches the uniques
+        pair_last = ip_last = None
+
+    hourly, daily = _count_rollups(
+        ((ip, page, visited_at, weight) for ip, page, _, visited_at, weight in visits),
+        pair_last,
+        ip_last,
+    )
+    _upsert_rollups(HourlyVisitRollup, hourly)
+    _upsert_rollups(DailyVisitRollup, daily)
+    _merge_sketches(_build_sketches((ip, page, visited_at) for ip, page, _, visited_at, _ in visits))
+    if current_app.config.get('VISITOR_LOG', True):
+        VisitLogService.append(visits)
+    db.session.commit()
+    return len(merged)
+
+
+def _upsert_visitor_rows(merged):
+    """
+    Insert or bump one Visitor row per merged (ip, page) in a single
+    INSERT ... ON CONFLICT DO UPDATE, so concurrent workers never race or
+    duplicate rows (no commit).
+    """
+    rows = [
+        {
+            'ip_address': ip_address,
+            'page_visited': page_visited,
+            'user_agent': user_agent,
+            'first_visit': first_visit,
+            'last_visit': last_visit,
+            'visit_count': count,
+            'is_unique': count == 1,
+        }
+        for (ip_address, page_visited), (user_agent, first_visit, last_visit, count) in merged.items()
+    ]
+
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for row in rows:
+            visitor = Visitor.query.filter_by(
+                ip_address=row['ip_address'],
+                page_visited=row['page_visited']
+            ).first()
+            if visitor is None:
+                db.session.add(Visitor(**row))
+                continue
+            visitor.last_visit = max(visitor.last_visit, row['last_visit'])
+            visitor.visit_count += row['visit_count']
+            visitor.is_unique = False  # Not unique on subsequent visits
+        return
+
+    t = Visitor.__table__
+    stmt = insert(t).values(rows)
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=['ip_address', 'page_visited'],
+            set_={
+                'visit_count': t.c.visit_count + stmt.excluded.visit_count,
+                'last_visit': case(
+                    (stmt.excluded.last_visit > t.c.last_visit, stmt.excluded.last_visit),
+                    else_=t.c.last_visit,
+                ),
+                'is_unique': False,  # Not unique on subsequent visits
+            },
+        )
+    )
+
+
+def _count_rollups(visits, pair_last, ip_last):
+    """
+    Count visits into hourly and daily buckets, per page and site-wide.
+
+    A visit is unique for a bucket when its (ip, page) - or, site-wide,
+    its IP - was last seen before the bucket started, and new when it was
+    never seen. Updates pair_last / ip_last in place; when they are None
+    (raw rows disabled) only visits are counted.
+
+    Args:
+        visits: (ip_address, page_visited, timestamp, count) in time order
+        pair_last: {(ip, page): last visit}, or None
+        ip_last: {ip: last visit on any page}, or None
+
+    Returns:
+        (hourly, daily) dicts of {(bucket, page): [visits, unique, new]}
+    """
+    hourly = {}
+    daily = {}
+    track = pair_last is not None
+    for ip_address, page_visited, visited_at, count in visits:
+        hour = visited_at.replace(minute=0, second=0, microsecond=0)
+        day = visited_at.date()
+        day_start = datetime.combine(day, datetime.min.time())
+        for last_seen, page in (
+            (pair_last.get((ip_address, page_visited)) if track else None, page_visited),
+            (ip_last.get(ip_address) if track else None, ALL_PAGES),
+        ):
+            for counts, bucket, bucket_start in ((hourly, hour, hour), (daily, day, day_start)):
+                entry = counts.setdefault((bucket, page), [0, 0, 0])
+                entry[0] += count
+                if not track:
+                    continue
+                if last_seen is None or last_seen < bucket_start:
+                    entry[1] += 1
+                if last_seen is None:
+                    entry[2] += 1
+        if track:
+            pair_last[(ip_address, page_visited)] = visited_at
+            ip_last[ip_address] = max(ip_last.get(ip_address, visited_at), visited_at)
+    return hourly, daily
+
+
+def _build_sketches(visits):
+    """
+    HyperLogLog sketches of IPs per (day, page), per day site-wide and all-time.
+
+    Args:
+        visits: Iterable of (ip_address, page_visited, timestamp)
+
+    Returns:
+        {(day, page): HyperLogLog}
+    """
+    sketches = {}
+    for ip_address, page_visited, visited_at in visits:
+        day = visited_at.date()
+        for key in ((day, page_visited), (day, ALL_PAGES), (ALL_TIME, ALL_PAGES)):
+            sketch = sketches.get(key)
+            if sketch is None:
+                sketch = sketches[key] = HyperLogLog()
+            sketch.add(ip_address)
+    return sketches
+
+
+def _merge_sketches(sketches):
+    """
+    Merge sketches into visit_sketches (no commit). Rows are created empty
+    first and then locked in key order, so concurrent workers' flushes
+    serialize instead of overwriting each other's registers.
+    """
+    if not sketches:
+        return
+
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        empty = HyperLogLog().to_bytes()
+        db.session.execute(
+            insert(VisitSketch.__table__)
+            .values([{'day': day, 'page': page, 'registers': empty} for day, page in sketches])
+            .on_conflict_do_nothing(index_elements=['day', 'page'])
+        )
+
+    days = {day for day, _ in sketches}
+    pages = {page for _, page in sketches}
+    stored = {
+        (row.day, row.page): row
+        for row in VisitSketch.query.filter(VisitSketch.day.in_(days), VisitSketch.page.in_(pages))
+        .order_by(VisitSketch.day, VisitSketch.page)
+        .with_for_update()
+    }
+    for key, sketch in sketches.items():
+        row = stored.get(key)
+        if row is None:
+            db.session.add(VisitSketch(day=key[0], page=key[1], registers=sketch.to_bytes()))
+        else:
+            row.registers = sketch.merge(HyperLogLog.from_bytes(row.registers)).to_bytes()
+
+
+def count_unique_visitors(start_day, end_day, page=ALL_PAGES):
+    """
+    Estimated distinct visitor IPs between two days (inclusive), by merging
+    the daily sketches. Pass ALL_TIME for both days for the all-time count.
+    """
+    merged = HyperLogLog()
+    for (registers,) in db.session.query(VisitSketch.registers).filter(
+        VisitSketch.page == page,
+        VisitSketch.day >= start_day,
+        VisitSketch.day <= end_day,
+    ):
+        merged.merge(HyperLogLog.from_bytes(registers))
+    return merged.count()
+
+
+def _upsert_rollups(model, counts):
+    """Add counts to rollup rows, inserting missing buckets (no commit)."""
+    rows = [
+        {'bucket': bucket, 'page': page, 'visits': v, 'unique_visitors': u, 'new_visitors': n}
+        for (bucket, page), (v, u, n) in counts.items()
+    ]
+    if not rows:
+        return
+
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        for row in rows:
+            rollup = db.session.get(model, (row['bucket'], row['page']))
+            if rollup is None:
+                db.session.add(model(**row))
+                continue
+            for column in ROLLUP_COLUMNS:
+                setattr(rollup, column, getattr(rollup, column) + row[column])
+        return
+
+    t = model.__table__
+    stmt = insert(t).values(rows)
+    db.session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=['bucket', 'page'],
+            set_={column: t.c[column] + stmt.excluded[column] for column in ROLLUP_COLUMNS},
+        )
+    )
+
+
+def rebuild_visit_rollups():
+    """
+    Rebuild the rollup tables and unique-visitor sketches from the visitors
+    table and commit.
+
+    Visitor rows only keep the first and last visit, so history is
+    approximate: the first hit is counted at first_visit and the rest at
+    last_visit.
+
+    Returns:
+        (hourly rows, daily rows, sketches) written
+    """
+    events = []
+    for ip_address, page_visited, first_visit, last_visit, visit_count in db.session.query(
+        Visitor.ip_address,
+        Visitor.page_visited,
+        Visitor.first_visit,
+        Visitor.last_visit,
+        Visitor.visit_count,
+    ):
+        events.append((ip_address, page_visited, first_visit, 1))
+        if visit_count > 1:
+            events.append((ip_address, page_visited, last_visit, visit_count - 1))
+    events.sort(key=lambda e: e[2])
+
+    hourly, daily = _count_rollups(events, {}, {})
+    sketches = _build_sketches((ip, page, visited_at) for ip, page, visited_at, _ in events)
+    HourlyVisitRollup.query.delete(synchronize_session=False)
+    DailyVisitRollup.query.delete(synchronize_session=False)
+    VisitSketch.query.delete(synchronize_session=False)
+    _upsert_rollups(HourlyVisitRollup, hourly)
+    _upsert_rollups(DailyVisitRollup, daily)
+    _merge_sketches(sketches)
+    db.session.commit()
+    return len(hourly), len(daily), len(sketches)
+
+
+class VisitBuffer:
+    """Bounded per-process visit queue drained by a background flush thread."""
+
+    def __init__(self, app):
+        self.app = app
+        self.max_size = app.config.get('VISITOR_QUEUE_SIZE', 10000)
+        self.flush_interval = app.config.get('VISITOR_FLUSH_INTERVAL', 5.0)
+        self.flush_batch = app.config.get('VISITOR_FLUSH_BATCH', 500)
+        self.counters = {'queued': 0, 'dropped': 0, 'flushed': 0, 'failed': 0}
+        self._queue = queue.Queue(maxsize=self.max_size)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._counters_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stopping = False
+        self._thread = None
+        self._pid = None
+
+    def put(self, visit):
+        """Queue a visit; drop it (and count the drop) if the queue is full."""
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(visit)
+        except queue.Full:
+            self._count('dropped')
+            return
+        self._count('queued')
+        if self._queue.qsize() >= self.flush_batch:
+            self._wake.set()
+
+    def flush(self):
+        """Drain the queue and write everything waiting (batches of VISITOR_FLUSH_BATCH)."""
+        with self._flush_lock:
+            while True:
+                batch = []
+                while len(batch) < self.flush_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                with self.app.app_context():
+                    try:
+                        write_visits(batch)
+                        self._count('flushed', len(batch))
+                    except Exception:
+                        db.session.rollback()
+                        self._count('failed', len(batch))
+                        self.app.logger.exception(
+                            'visitor flush failed, %s visit(s) lost', len(batch)
+                        )
+                    finally:
+                        db.session.remove()
+
+    def stop(self):
+        """Stop the flush thread and write whatever is still queued (worker shutdown)."""
+        self._stopping = True
+        self._wake.set()
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+        counts = self.counts()
+        if counts['dropped'] or counts['failed']:
+            self.app.logger.warning(
+                'visitor tracking shutdown pid=%s queued=%s flushed=%s dropped=%s failed=%s',
+                os.getpid(), counts['queued'], counts['flushed'],
+                counts['dropped'], counts['failed'],
+            )
+
+    def counts(self):
+        """Consistent snapshot of the queue/flush/drop counters."""
+        with self._counters_lock:
+            return dict(self.counters)
+
+    def _count(self, name, n=1):
+        # Request threads and the flush thread update these concurrently
+        with self._counters_lock:
+            self.counters[name] += n
+
+    def _ensure_thread(self):
+        """Start the flush thread lazily, once per process (safe with preload/fork)."""
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            pid = os.getpid()
+            if self._pid != pid:
+                # Forked child: the parent's queue and thread don't carry over
+                self._queue = queue.Queue(maxsize=self.max_size)
+                self._counters_lock = threading.Lock()
+                self.counters = dict.fromkeys(self.counters, 0)
+                self._pid = pid
+                self._thread = None
+                atexit.register(self.stop)
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name='visitor-flush',
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            self._wake.wait(timeout=self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+
+def _get_buffer(app):
+    """One visit buffer per app instance, stored on app.extensions."""
+    buffer = app.extensions.get('visit_buffer')
+    if buffer is None:
+        buffer = app.extensions.setdefault('visit_buffer', VisitBuffer(app))
+    return buffer
+
+
+def get_tracking_counters(app=None):
+    """Queue/flush/drop and tracking-policy counters for this worker process."""
+    app = app or current_app._get_current_object()
+    buffer = app.extensions.get('visit_buffer')
+    counters = buffer.counts() if buffer else {'queued': 0, 'dropped': 0, 'flushed': 0, 'failed': 0}
+    counters['pending'] = buffer._queue.qsize() if buffer else 0
+    with _policy_counters_lock:
+        counters.update(_policy_counters)
+    return counters
+
+
+def shutdown_tracking(app):
+    """Flush queued visits before the worker exits (gunicorn worker_exit hook)."""
+    buffer = app.extensions.get('visit_buffer')
+    if buffer is not None:
+        buffer.stop()
 
 
 def get_visitor_stats():
-    """Get visitor statistics."""
+    """Get visitor statistics (reads only the rollups and sketches)."""
     try:
-        # Total unique visitors
-        total_unique = Visitor.query.filter_by(is_unique=True).count()
-        
-        # Total visits
-        total_visits = db.session.query(db.func.sum(Visitor.visit_count)).scalar() or 0
-        
-        # Today's stats
+        # Visits come from the daily rollups
         today = datetime.utcnow().date()
-        today_visitors = Visitor.query.filter(
-            db.func.date(Visitor.first_visit) == today
-        ).count()
-        
-        today_unique = Visitor.query.filter(
-            db.func.date(Visitor.first_visit) == today,
-            Visitor.is_unique == True
-        ).count()
-        
-        # Recent activity (last 7 days)
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_visitors = Visitor.query.filter(
-            Visitor.last_visit >= week_ago
-        ).count()
-        
+        total_visits, today_visits = DailyVisitRollup.query.filter(
+            DailyVisitRollup.page == ALL_PAGES
+        ).with_entities(
+            db.func.coalesce(db.func.sum(DailyVisitRollup.visits), 0),
+            db.func.coalesce(
+                db.func.sum(case((DailyVisitRollup.bucket == today, DailyVisitRollup.visits), else_=0)), 0
+            ),
+        ).one()
+
+        # Distinct IPs from the HyperLogLog sketches: all-time, today, last 7 days
+        total_unique = count_unique_visitors(ALL_TIME, ALL_TIME)
+        today_unique = count_unique_visitors(today, today)
+        recent_visitors = count_unique_visitors(today - timedelta(days=6), today)
+
         # Top pages
+        visits = db.func.sum(DailyVisitRollup.visits)
         top_pages = db.session.query(
-            Visitor.page_visited,
-            db.func.count(Visitor.id).label('visits')
-        ).group_by(Visitor.page_visited).order_by(
-            db.func.count(Visitor.id).desc()
-        ).limit(10).all()
-        
+            DailyVisitRollup.page.label('page_visited'),
+            visits.label('visits')
+        ).filter(DailyVisitRollup.page != ALL_PAGES).group_by(
+            DailyVisitRollup.page
+        ).order_by(visits.desc()).limit(10).all()
+
         return {
             'total_unique': total_unique,
             'total_visits': total_visits,
-            'today_visitors': today_visitors,
+            'today_visitors': today_visits,
             'today_unique': today_unique,
             'recent_visitors': recent_visitors,
             'top_pages': top_pages,
+            'tracking': get_tracking_counters(),
         }
-        
+
     except Exception:
         return {
             'total_unique': 0,
@@ -102,7 +606,68 @@ def get_visitor_stats():
             'today_unique': 0,
             'recent_visitors': 0,
             'top_pages': [],
+            'tracking': get_tracking_counters(),
+        }
+
+
+def get_visit_timeseries(granularity='day', page=ALL_PAGES, periods=30):
+    """
+    Visits per hour or day from the rollups, oldest first, with empty
+    buckets filled with zeros.
+
+    Args:
+        granularity: 'hour' or 'day'
+        page: Endpoint name, or ALL_PAGES for site-wide totals
+        periods: Number of buckets ending with the current one
+
+    Returns:
+        List of dicts with bucket, visits, unique_visitors, new_visitors
+        (plus unique_estimate from the sketches for daily series)
+    """
+    now = datetime.utcnow()
+    if granularity == 'hour':
+        model = HourlyVisitRollup
+        step = timedelta(hours=1)
+        end = now.replace(minute=0, second=0, microsecond=0)
+    else:
+        model = DailyVisitRollup
+        step = timedelta(days=1)
+        end = now.date()
+    start = end - step * (periods - 1)
+
+    rows = {
+        r.bucket: r
+        for r in model.query.filter(
+            model.page == page,
+            model.bucket >= start,
+            model.bucket <= end,
+        )
+    }
+    sketches = {}
+    if granularity != 'hour':
+        sketches = {
+            day: HyperLogLog.from_bytes(registers).count()
+            for day, registers in db.session.query(VisitSketch.day, VisitSketch.registers).filter(
+                VisitSketch.page == page,
+                VisitSketch.day >= start,
+                VisitSketch.day <= end,
+            )
+        }
+
+    series = []
+    for i in range(periods):
+        bucket = start + step * i
+        row = rows.get(bucket)
+        point = {
+            'bucket': bucket.isoformat(),
+            'visits': row.visits if row else 0,
+            'unique_visitors': row.unique_visitors if row else 0,
+            'new_visitors': row.new_visitors if row else 0,
         }
+        if granularity != 'hour':
+            point['unique_estimate'] = sketches.get(bucket, 0)
+        series.append(point)
+    return series
 
 
 def get_client_ip():
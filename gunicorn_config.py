@@ -9,9 +9,13 @@ import os
 bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
 
 # Workers
+# gthread: every request, and every open /api/stream client, holds one of a
+# worker's threads. app/config.py reads the same GUNICORN_THREADS to cap live
+# streams per worker below the thread count (LIVE_MAX_CONNECTIONS) and to
+# size the database pool, so keep them in the environment, not only here.
 workers = int(os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
-worker_class = "sync"
-worker_connections = 1000
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 64))
 
 # Timeouts
 timeout = 120
@@ -27,3 +31,12 @@ proc_name = "league_site"
 
 # Application
 wsgi_app = "run:app"
+
+
+def worker_exit(server, worker):
+    """Flush queued visitor hits before the worker process exits."""
+    from app.services.visitor_service import shutdown_tracking
+
+    app = getattr(worker, "wsgi", None)
+    if app is not None:
+        shutdown_tracking(app)
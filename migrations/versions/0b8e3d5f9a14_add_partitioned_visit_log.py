@@ -0,0 +1,40 @@
+"""Add partitioned visit_log parent table (PostgreSQL)
+
+Revision ID: 0b8e3d5f9a14
+Revises: f2a7c4e91d35
+Create Date: 2026-10-16 17:12:09.331870
+
+Monthly partitions (visit_log_YYYY_MM) are created on demand by
+VisitLogService. Other databases use standalone monthly tables instead,
+so there is nothing to create for them here.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0b8e3d5f9a14'
+down_revision = 'f2a7c4e91d35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "CREATE TABLE visit_log ("
+        "visited_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, "
+        "ip_address VARCHAR(45) NOT NULL, "
+        "page_visited VARCHAR(255) NOT NULL, "
+        "user_agent TEXT, "
+        "weight INTEGER NOT NULL DEFAULT 1"
+        ") PARTITION BY RANGE (visited_at)"
+    )
+    op.execute("CREATE INDEX ix_visit_log_visited_at ON visit_log (visited_at)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Drops every monthly partition with it
+    op.execute("DROP TABLE visit_log")
@@ -0,0 +1,124 @@
+"""
+Benchmark /api/table and /api/matches payload generation: ORM objects +
+dict building + stdlib json vs. projected rows + precompiled serializers,
+encoded with stdlib json and (when installed) orjson.
+Run: python scripts/benchmark_api_payloads.py [--teams 20] [--repeat 20]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.orm import joinedload
+
+from app import create_app
+from app.api.fields import STANDINGS, MATCHES
+from app.json_provider import FastJSONProvider
+from app.models import Standing, Match
+from check_query_budget import seed  # Sibling script (scripts/ is on sys.path)
+
+
+def orm_table(standings) -> list:
+    """The serializer /api/table used before projections."""
+    return [
+        {
+            "position": s.position,
+            "previous_position": s.previous_position,
+            "position_change": s.position_change,
+            "team_id": s.team_id,
+            "team_name": s.team.name,
+            "team_short_name": s.team.short_name,
+            "played": s.played,
+            "won": s.won,
+            "drawn": s.drawn,
+            "lost": s.lost,
+            "goals_for": s.goals_for,
+            "goals_against": s.goals_against,
+            "goal_difference": s.goal_difference,
+            "points": s.points,
+            "form": s.form or "",
+        }
+        for s in standings
+    ]
+
+
+def orm_matches(matches) -> list:
+    """The serializer /api/matches used before projections."""
+    return [
+        {
+            "id": m.id,
+            "matchday": m.matchday,
+            "kickoff": m.kickoff.isoformat() if m.kickoff else None,
+            "home_team_id": m.home_team_id,
+            "home_team_name": m.home_team.name,
+            "away_team_id": m.away_team_id,
+            "away_team_name": m.away_team.name,
+            "home_goals": m.home_goals,
+            "away_goals": m.away_goals,
+            "is_played": m.is_played,
+            "score_display": m.score_display,
+        }
+        for m in matches
+    ]
+
+
+def best_time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, default=20, help="Teams (matches = teams x (teams - 1))")
+    parser.add_argument("--repeat", type=int, default=20, help="Timing repetitions")
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        seed(args.teams, 1)
+        stdlib = DefaultJSONProvider(app)
+        fast = FastJSONProvider(app)
+        encoders = [("stdlib", stdlib)] + ([("orjson", fast)] if fast.fast else [])
+
+        standing_entities = Standing.query.options(joinedload(Standing.team)).order_by(Standing.position).all()
+        match_entities = (
+            Match.query.options(joinedload(Match.home_team), joinedload(Match.away_team))
+            .order_by(Match.matchday, Match.kickoff, Match.id)
+            .all()
+        )
+        table_names, match_names = tuple(STANDINGS.fields), tuple(MATCHES.fields)
+        keys = (Match.matchday, Match.kickoff, Match.id)
+        standing_rows = STANDINGS.query(table_names).order_by(Standing.position).all()
+        match_rows = MATCHES.query(match_names, keys).order_by(*keys).all()
+
+        cases = (
+            ("/api/table", len(standing_rows), lambda: orm_table(standing_entities),
+             lambda: STANDINGS.serialize(table_names, standing_rows)),
+            ("/api/matches", len(match_rows), lambda: orm_matches(match_entities),
+             lambda: MATCHES.serialize(match_names, match_rows, keys)),
+        )
+        for endpoint, count, from_orm, from_rows in cases:
+            if from_orm() != from_rows():
+                print(f"{endpoint}: ORM and row serializers disagree!")
+                sys.exit(1)
+            print(f"{endpoint} ({count} rows)")
+            baseline = best_time(lambda: stdlib.dumps({"rows": from_orm()}), args.repeat)
+            print(f"  orm + stdlib:  {baseline * 1000:.2f} ms")
+            for name, provider in encoders:
+                elapsed = best_time(lambda: provider.dumps({"rows": from_rows()}), args.repeat)
+                print(f"  rows + {name + ':':8}{elapsed * 1000:.2f} ms ({baseline / elapsed:.1f}x)")
+        if not fast.fast:
+            print("orjson not installed; only the stdlib encoder was timed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark standings engines: Python loop vs vectorized NumPy.
+Uses synthetic double round-robin seasons, no database required. Pass
+several --teams sizes to find the crossover for STANDINGS_NUMPY_MIN_TEAMS.
+Run: python scripts/benchmark_standings.py [--teams 3 10 20 40] [--seasons 50]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.standings_service import StandingsService
+
+
+def make_season(num_teams: int, rng: random.Random) -> tuple:
+    """Double round-robin with random scores. Returns (matches most recent first, team_ids)."""
+    team_ids = list(range(1, num_teams + 1))
+    matches = [
+        (home, away, rng.randint(0, 4), rng.randint(0, 4))
+        for home in team_ids
+        for away in team_ids
+        if home != away
+    ]
+    rng.shuffle(matches)
+    return matches, team_ids
+
+
+def run_engine(engine: str, seasons: list, repeat: int) -> float:
+    """Best wall time (seconds) for ranking all seasons once."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for matches, team_ids in seasons:
+            StandingsService.rank_table(matches, team_ids, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--teams", type=int, nargs="+", default=[20], help="Teams per season (one run per size)")
+    parser.add_argument("--seasons", type=int, default=50, help="Seasons to rebuild")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for num_teams in args.teams:
+        seasons = [make_season(num_teams, rng) for _ in range(args.seasons)]
+
+        # Both engines must agree on every table before timing them
+        for matches, team_ids in seasons:
+            expected = [
+                (tid, {k: v for k, v in s.items() if k != "matches"})
+                for tid, s in StandingsService.rank_table(matches, team_ids, engine="python")
+            ]
+            actual = StandingsService.rank_table(matches, team_ids, engine="numpy")
+            if expected != actual:
+                print("Mismatch between python and numpy engines!")
+                sys.exit(1)
+
+        python_time = run_engine("python", seasons, args.repeat)
+        numpy_time = run_engine("numpy", seasons, args.repeat)
+        matches_per_season = num_teams * (num_teams - 1)
+
+        print(f"{args.seasons} seasons x {num_teams} teams ({matches_per_season} matches each)")
+        print(f"  python: {python_time * 1000:.1f} ms")
+        print(f"  numpy:  {numpy_time * 1000:.1f} ms")
+        print(f"  speedup: {python_time / numpy_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""
+Check SQL statements per JSON API request, and per recorded match (standings
+queued for the worker, and rebuilt in the request with STANDINGS_RECOMPUTE
+"sync", the default), against fixed budgets. Seeds an in-memory database at two sizes and fails if any
+case goes over its budget or issues more statements on the larger dataset
+(N+1).
+Run: python scripts/check_query_budget.py [--budget 6] [--match-budget 12] [--sync-budget 24]
+"""
+
+import argparse
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models import Season, Team, Player, Match, Standing, PlayerSeasonStats
+from app.models.season import season_teams
+from app.services.match_service import MatchService
+
+
+ENDPOINTS = (
+    "/api/table",
+    "/api/teams?per_page=100",
+    "/api/players?per_page=100",
+    "/api/matches?per_page=100",
+    "/api/leaderboards",
+)
+
+MATCH_EVENTS = 30
+
+
+def seed(num_teams: int, players_per_team: int) -> None:
+    """Fresh schema with one season, a double round-robin and a table."""
+    db.drop_all()
+    db.create_all()
+
+    season = Season()
+    season.name = "2024-2025"
+    season.start_date = date(2024, 8, 1)
+    season.end_date = date(2025, 5, 31)
+    season.is_active = True
+    db.session.add(season)
+    db.session.flush()
+
+    db.session.execute(
+        Team.__table__.insert(),
+        [{"id": i, "name": f"Team {i:02d}", "short_name": f"T{i:02d}"} for i in range(1, num_teams + 1)],
+    )
+    team_ids = list(range(1, num_teams + 1))
+    db.session.execute(
+        season_teams.insert(),
+        [{"season_id": season.id, "team_id": tid} for tid in team_ids],
+    )
+
+    players = [
+        {
+            "id": (tid - 1) * players_per_team + n,
+            "first_name": "Player",
+            "last_name": f"{tid:02d}-{n:02d}",
+            "position": "MID",
+            "team_id": tid,
+        }
+        for tid in team_ids
+        for n in range(1, players_per_team + 1)
+    ]
+    db.session.execute(Player.__table__.insert(), players)
+    db.session.execute(
+        PlayerSeasonStats.__table__.insert(),
+        [
+            {"player_id": p["id"], "season_id": season.id, "team_id": p["team_id"], "goals": p["id"] % 7}
+            for p in players
+        ],
+    )
+
+    kickoff = datetime(2024, 8, 10, 15)
+    db.session.execute(
+        Match.__table__.insert(),
+        [
+            {
+                "matchday": md,
+                "kickoff": kickoff + timedelta(days=7 * md),
+                "season_id": season.id,
+                "home_team_id": home,
+                "away_team_id": away,
+                "is_played": False,
+            }
+            for md, (home, away) in enumerate(
+                ((h, a) for h in team_ids for a in team_ids if h != a), start=1
+            )
+        ],
+    )
+    db.session.execute(
+        Standing.__table__.insert(),
+        [{"position": pos, "season_id": season.id, "team_id": tid} for pos, tid in enumerate(team_ids, start=1)],
+    )
+    db.session.commit()
+
+
+def match_events(players_per_team: int, corrected: bool = False, away_team: int = 2) -> list:
+    """
+    MATCH_EVENTS goals, cards and substitutions for team 1 at home to
+    away_team (match 1 against team 2, match 2 against team 3). The
+    corrected list moves one event, drops one and adds one, like an admin
+    fixing a result.
+    """
+    home = list(range(1, players_per_team + 1))
+    first_away = (away_team - 1) * players_per_team + 1
+    away = list(range(first_away, first_away + players_per_team))
+    events = []
+    for i in range(MATCH_EVENTS):
+        side = home if i % 2 == 0 else away
+        player, other = side[i // 2 % len(side)], side[(i // 2 + 1) % len(side)]
+        minute = 1 + i * 3
+        kind = i % 4
+        if kind == 0:
+            events.append({"event_type": "goal", "minute": minute, "player_id": player, "assist_id": other})
+        elif kind == 2:
+            events.append({"event_type": "substitution", "minute": minute, "player_off_id": player, "player_on_id": other})
+        else:
+            events.append({"event_type": "red" if i % 8 == 3 else "yellow", "minute": minute, "player_id": player})
+    if corrected:
+        events[0] = {**events[0], "minute": 2}
+        events[-1] = {"event_type": "goal", "minute": 91, "player_id": away[0], "is_penalty": True}
+    return events
+
+
+def count_statements(engine, action) -> int:
+    """Statements executed while running action()."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        action()
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+    return len(executed)
+
+
+def get(client, url: str):
+    """Action serving one GET."""
+    def action():
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} returned {response.status_code}")
+    return action
+
+
+def record(app, players_per_team: int, corrected: bool, recompute: str = "worker"):
+    """
+    Action recording (or correcting) a match in its own app context. With
+    the worker, match 1 (standings only queued); with "sync", match 2, so
+    the standings and snapshot rebuild runs in the request for a new result.
+    """
+    match_id = 1 if recompute == "worker" else 2
+
+    def action():
+        events = match_events(players_per_team, corrected, away_team=match_id + 1)
+        app.config["STANDINGS_RECOMPUTE"] = recompute
+        try:
+            with app.app_context():
+                MatchService.record_match_result(match_id, 4, 4 if corrected else 3, events)
+        finally:
+            app.config["STANDINGS_RECOMPUTE"] = "worker"
+    return action
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=int, default=6, help="Max statements per API request")
+    parser.add_argument("--match-budget", type=int, default=12, help="Max statements per recorded match")
+    parser.add_argument(
+        "--sync-budget", type=int, default=24,
+        help="Max statements per recorded match with STANDINGS_RECOMPUTE=sync",
+    )
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    app.config["VISITOR_TRACK_ENDPOINTS"] = frozenset()  # Keep tracking writes out of the counts
+    app.config["STANDINGS_RECOMPUTE"] = "worker"  # Except the sync case, standings are only queued
+    client = app.test_client()
+
+    cases = {url: args.budget for url in ENDPOINTS}
+    cases[f"record match ({MATCH_EVENTS} events)"] = args.match_budget
+    cases[f"re-record match ({MATCH_EVENTS} events)"] = args.match_budget
+    cases["record match, sync standings"] = args.sync_budget
+
+    counts = {}
+    for label, size in (("small", (4, 3)), ("large", (20, 25))):
+        with app.app_context():
+            seed(*size)
+        # Requests run outside the seeding context, each in its own app context
+        # like in production (nothing memoized on g carries over)
+        with app.app_context():
+            engine = db.engine
+        actions = {url: get(client, url) for url in ENDPOINTS}
+        actions[f"record match ({MATCH_EVENTS} events)"] = record(app, size[1], False)
+        actions[f"re-record match ({MATCH_EVENTS} events)"] = record(app, size[1], True)
+        actions["record match, sync standings"] = record(app, size[1], False, recompute="sync")
+        counts[label] = {name: count_statements(engine, action) for name, action in actions.items()}
+
+    failed = False
+    for name, budget in cases.items():
+        small, large = counts["small"][name], counts["large"][name]
+        status = "ok"
+        if large > budget:
+            status, failed = "over budget", True
+        elif large > small:
+            status, failed = "grows with data", True
+        print(f"{name:32} small={small:<3} large={large:<3} {status}")
+
+    if failed:
+        sys.exit(1)
+    print(
+        f"All cases within budget ({args.budget} per request, {args.match_budget} per match, "
+        f"{args.sync_budget} per match with sync standings)."
+    )
+
+if __name__ == "__main__":
+    main()